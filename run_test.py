@@ -14,11 +14,13 @@ import argparse
 import json
 import sys
 import time
+from dataclasses import asdict
 from pathlib import Path
 from typing import List, Optional, Type
 
 from rich.console import Console
 
+from src.common.compilation import BenchmarkAborted
 from src.creation.nuxt_form_oneshot.test_runner import BenchmarkResult
 
 OUTPUT_DIR = Path("results")
@@ -248,7 +250,7 @@ def _save_agent_results(
         "fixture": fixture_name,
         "n_runs": requested_runs,
         "prompt": prompt_text,
-        "runs": [r.__dict__ for r in results],
+        "runs": [asdict(r) for r in results],
     }
     with (agent_output_dir / "summary.json").open("w", encoding="utf-8") as f:
         json.dump(summary, f, indent=2)
@@ -310,7 +312,7 @@ def save_results(
     model_safe = model.replace(":", "__")
     output_file = base / f"{model_safe}__{fixture_name}__{timestamp}.json"
     with open(output_file, "w") as f:
-        json.dump([r.__dict__ for r in results], f, indent=2)
+        json.dump([asdict(r) for r in results], f, indent=2)
     if prompt_text is not None:
         output_file.with_suffix(".prompt.md").write_text(prompt_text)
     return output_file
@@ -340,6 +342,9 @@ def run_fixture(
         log_prompts: If True, write per-step prompt logs to prompts.jsonl.
         agent_output_dir: For agent tests — pre-created output folder where
             prompts.jsonl will be written (all runs share the same file).
+
+    Runs stop early if the runner raises BenchmarkAborted; completed runs are
+    still returned (None if no run completed). The runner is closed afterwards.
     """
     runner_class = _get_runner_class(runner_module)
     try:
@@ -353,31 +358,40 @@ def run_fixture(
     is_agent = hasattr(runner_module, "AgentTest")
 
     results = []
-    for i in range(runs):
-        console.print(f"[dim]── Run {i + 1}/{runs} [{model} - {fixture_path.name}] ──[/dim]")
-        run_kwargs = {"run_number": i + 1}
-
-        if log_prompts and is_agent and agent_output_dir is not None:
-            # All runs append to the same prompts.jsonl inside the output folder.
-            prompt_log = agent_output_dir / "prompts.jsonl"
-            if hasattr(test, "run") and "prompt_log_path" in test.run.__code__.co_varnames:
-                run_kwargs["prompt_log_path"] = prompt_log
-                if i == 0:
-                    console.print(f"[dim]  prompt log → {prompt_log}[/dim]")
-        elif log_prompts and not is_agent:
-            # Single-shot: legacy per-run log
-            if hasattr(test, "run") and "prompt_log_path" in test.run.__code__.co_varnames:
-                model_safe = model.replace(":", "_").replace(".", "-")
-                log_base = output_base if output_base is not None else OUTPUT_DIR
-                log_base.mkdir(exist_ok=True)
-                run_kwargs["prompt_log_path"] = (
-                    log_base / f"{model_safe}__{fixture_path.name}__run{i+1}__prompts.jsonl"
-                )
-                console.print(f"[dim]  prompt log → {run_kwargs['prompt_log_path']}[/dim]")
+    try:
+        for i in range(runs):
+            console.print(f"[dim]── Run {i + 1}/{runs} [{model} - {fixture_path.name}] ──[/dim]")
+            run_kwargs = {"run_number": i + 1}
+
+            if log_prompts and is_agent and agent_output_dir is not None:
+                # All runs append to the same prompts.jsonl inside the output folder.
+                prompt_log = agent_output_dir / "prompts.jsonl"
+                if hasattr(test, "run") and "prompt_log_path" in test.run.__code__.co_varnames:
+                    run_kwargs["prompt_log_path"] = prompt_log
+                    if i == 0:
+                        console.print(f"[dim]  prompt log → {prompt_log}[/dim]")
+            elif log_prompts and not is_agent:
+                # Single-shot: legacy per-run log
+                if hasattr(test, "run") and "prompt_log_path" in test.run.__code__.co_varnames:
+                    model_safe = model.replace(":", "_").replace(".", "-")
+                    log_base = output_base if output_base is not None else OUTPUT_DIR
+                    log_base.mkdir(exist_ok=True)
+                    run_kwargs["prompt_log_path"] = (
+                        log_base / f"{model_safe}__{fixture_path.name}__run{i+1}__prompts.jsonl"
+                    )
+                    console.print(f"[dim]  prompt log → {run_kwargs['prompt_log_path']}[/dim]")
 
-        result = test.run(**run_kwargs)
-        results.append(result)
-        runner_module.format_run(result)
+            try:
+                result = test.run(**run_kwargs)
+            except BenchmarkAborted as e:
+                console.print(f"[red]✗ Aborting '{fixture_path.name}' after {len(results)} run(s): {e}[/red]")
+                if not results:
+                    return None
+                break
+            results.append(result)
+            runner_module.format_run(result)
+    finally:
+        test.close()
 
     return results, prompt_text
 
@@ -564,11 +578,18 @@ def main() -> int:
                 continue
 
             results, prompt_text = run_result
+            # run_fixture stops early (and keeps completed runs) on BenchmarkAborted.
+            aborted = len(results) < args.runs
+            if aborted:
+                had_errors = True
+                console.print(
+                    f"[yellow]⚠ Saving {len(results)}/{args.runs} completed run(s) for '{fixture_path.name}'[/yellow]"
+                )
             output_file = save_results(
                 results,
                 model,
                 fixture_path.name,
-                requested_runs=args.runs,
+                requested_runs=len(results) if aborted else args.runs,
                 agent_output_dir=agent_out_dir,
                 output_dir=model_dir,
                 prompt_text=prompt_text,
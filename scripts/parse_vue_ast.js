@@ -11,27 +11,29 @@
  * - Import statements (including type-only imports)
  * - Script lang attribute
  *
- * Usage: node parse_vue_ast.js <vue-file-path>
+ * Usage: node parse_vue_ast.js [vue-file-path]
+ *        (reads the Vue source from piped stdin when no path is given)
  * Output: JSON with AST structure information
  */
 
 const { parse, compileScript } = require('@vue/compiler-sfc');
 const fs = require('fs');
 
-// Check command line arguments
-if (process.argv.length < 3) {
+// Source comes from the given file, or from stdin (fd 0) when no path is passed.
+// An interactive terminal is not a source: keep the usage error instead of hanging.
+if (process.argv.length < 3 && process.stdin.isTTY) {
   console.error(JSON.stringify({
-    error: 'Usage: node parse_vue_ast.js <vue-file-path>'
+    error: 'Usage: node parse_vue_ast.js <vue-file-path> (or pipe the source on stdin)'
   }));
   process.exit(1);
 }
 
-const filePath = process.argv[2];
+const filePath = process.argv[2] || 'stdin.vue';
 
-// Read the Vue file
+// Read the Vue source
 let source;
 try {
-  source = fs.readFileSync(filePath, 'utf-8');
+  source = fs.readFileSync(process.argv[2] || 0, 'utf-8');
 } catch (err) {
   console.error(JSON.stringify({
     error: `Failed to read file: ${err.message}`
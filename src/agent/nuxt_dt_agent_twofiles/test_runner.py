@@ -12,24 +12,31 @@ Differences from nuxt-dt-agent-guided (Test F):
 
 import json
 import logging
+import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from rich.console import Console
 from smolagents import tool
 
 from src.agent.common.agent_client import run_agent
+from src.common.compilation import DEFAULT_COMPILE_TIMEOUT, CompileTimeoutBudget, resolve_compile_command
+from src.common.files import atomic_write
 from src.agent.nuxt_dt_agent_twofiles import validator
 from src.agent.nuxt_dt_agent_twofiles.validator import ASTResult, NamingResult
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Compiler output lines reported back to the agent by run_compilation
+_ERROR_LINE_RE = re.compile(r"^.*(?:error TS| - error).*$", re.MULTILINE)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class AgentBenchmarkResult:
     """Complete agent test execution result for the nuxt-dt-agent-twofiles fixture."""
 
@@ -75,10 +82,14 @@ def _make_tools(
     allowed_paths: List[str],
     compilation_cwd: Path,
     compilation_command: str,
+    compile_timeout: float = DEFAULT_COMPILE_TIMEOUT,
+    compile_argv: Optional[List[str]] = None,
 ) -> List:
     """Build tools for the twofiles fixture: ONLY write_file + run_compilation."""
     target_project = target_project.resolve()
     compilation_cwd = compilation_cwd.resolve()
+    if compile_argv is None:
+        compile_argv = resolve_compile_command(compilation_command, compilation_cwd, target_project)
     resolved_root = target_project
     allowed_write_set = set(allowed_paths)
 
@@ -90,23 +101,19 @@ def _make_tools(
     def _run_compile() -> str:
         try:
             result = subprocess.run(
-                ["npm", "run", compilation_command],
+                compile_argv,
                 cwd=compilation_cwd,
                 capture_output=True,
                 text=True,
-                timeout=60,
+                timeout=compile_timeout,
             )
             if result.returncode == 0:
                 return "Compilation succeeded."
             combined = result.stdout + "\n" + result.stderr
-            error_lines = [
-                line.strip()
-                for line in combined.split("\n")
-                if "error TS" in line or " - error" in line
-            ]
+            error_lines = [match.group().strip() for match in _ERROR_LINE_RE.finditer(combined)]
             return "\n".join(error_lines) if error_lines else combined.strip()
         except subprocess.TimeoutExpired:
-            return "ERROR: Compilation timed out after 60 seconds."
+            return f"ERROR: Compilation timed out after {compile_timeout:.0f} seconds."
         except Exception as e:
             return f"ERROR: {e}"
 
@@ -195,6 +202,7 @@ class AgentTest:
                 f"Target file '{target_file_rel}' not found in {self.target_project}"
             )
         self.original_code = self.target_file.read_text()
+        self._original_bytes = self.original_code.encode("utf-8")
 
         columns_rel = "apps/web/src/orders/columns.ts"
         self._columns_file = self.target_project / columns_rel
@@ -204,6 +212,20 @@ class AgentTest:
         self._types_file = self.target_project / types_rel
         self.original_types = self._types_file.read_text() if self._types_file.exists() else ""
 
+        # Validation settings, constant across runs
+        self._required_patterns = self.validation_spec.get("required_patterns", {})
+        self._naming_conventions = self.validation_spec.get("naming_conventions", {})
+        self._weights = self.validation_spec["scoring"]
+
+        # Whether the stubs on disk are pristine; lets run() skip redundant restores
+        self._file_state: Literal["original", "generated"] = "original"
+
+        # Adaptive compile timeout, pooled across all runs of this instance
+        self._compile_budget = CompileTimeoutBudget()
+        # Single worker: compilation overlaps the in-process checks, never another compile.
+        # Shut down by close() once all runs are done.
+        self._compile_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="compile")
+
         self.max_steps = self.validation_spec.get("max_steps", 15)
         self.allowed_paths: List[str] = self.validation_spec.get(
             "allowed_write_paths", [target_file_rel]
@@ -212,29 +234,33 @@ class AgentTest:
         compilation_cwd_rel = self.validation_spec.get("compilation_cwd", "apps/web")
         self._compilation_cwd = self.target_project / compilation_cwd_rel
         self._compilation_command = self.validation_spec.get("compilation_command", "check-types")
+        # Resolved once: package.json and node_modules/.bin do not change between runs
+        self._compile_argv = resolve_compile_command(
+            self._compilation_command, self._compilation_cwd, self.target_project
+        )
 
     def run(self, run_number: int = 1, prompt_log_path: "Optional[Path]" = None) -> AgentBenchmarkResult:
         """Execute a single agent test run."""
+        # Stop before calling the model once earlier runs exhausted the compile budget
+        self._compile_budget.check()
+
         timestamp = datetime.now().isoformat()
         errors: List[str] = []
 
         try:
-            # 1. Restore stubs
-            self.target_file.write_text(self.original_code)
-            if self._columns_file.exists() or self.original_columns:
-                self._columns_file.write_text(self.original_columns)
-            if self._types_file.exists() or self.original_types:
-                self._types_file.write_text(self.original_types)
-
-            # 2. Build tools
+            # 1. Build tools
             tools = _make_tools(
                 target_project=self.target_project,
                 allowed_paths=self.allowed_paths,
                 compilation_cwd=self._compilation_cwd,
                 compilation_command=self._compilation_command,
+                compile_timeout=self._compile_budget.timeout(),
+                compile_argv=self._compile_argv,
             )
 
-            # 3. Run agent
+            # 2. Run agent
+            # From here on the agent may write to any allowed path
+            self._file_state = "generated"
             agent_result = run_agent(
                 model=self.model,
                 task=self.prompt,
@@ -244,7 +270,7 @@ class AgentTest:
             )
             errors.extend(agent_result.errors)
 
-            # 3b. Early exit if agent crashed before making any tool calls.
+            # 2b. Early exit if agent crashed before making any tool calls.
             if agent_result.run_crashed:
                 return AgentBenchmarkResult(
                     model=self.model,
@@ -260,7 +286,7 @@ class AgentTest:
                     naming_score=0.0,
                     naming_violations=[],
                     final_score=0.0,
-                    scoring_weights=self.validation_spec["scoring"],
+                    scoring_weights=self._weights,
                     tokens_per_sec=agent_result.tokens_per_sec,
                     duration_sec=agent_result.duration_sec,
                     output_code="",
@@ -280,7 +306,7 @@ class AgentTest:
                 if e.get("tool") in ("write_file", "run_compilation")
             )
 
-            # 4. Read final state of both files
+            # 3. Read final state of both files
             output_code = ""
             columns_code = ""
             try:
@@ -297,30 +323,33 @@ class AgentTest:
             if columns_code:
                 combined_code = output_code + "\n\n// --- columns.ts ---\n" + columns_code
 
-            # 5a. Compile
-            compilation_result = validator.validate_compilation(
+            # 4a. Compile in the background while the pattern and naming checks run
+            compilation_future = self._compile_pool.submit(
+                validator.validate_compilation,
                 target_project=self.target_project,
                 compilation_command=self._compilation_command,
                 compilation_cwd=self._compilation_cwd,
+                timeout=self._compile_budget.timeout(),
+                compile_argv=self._compile_argv,
             )
 
-            # 5b. Pattern check
+            # 4b. Pattern check
             ast_result: ASTResult
             try:
                 ast_result = validator.validate_ast_structure(
                     combined_code,
-                    self.validation_spec.get("required_patterns", {}),
+                    self._required_patterns,
                 )
             except Exception as e:
                 errors.append(f"AST validation error: {e}")
                 ast_result = ASTResult(score=0.0, missing=["pattern validation failed"])
 
-            # 5c. Naming check
+            # 4c. Naming check
             naming_result: NamingResult
             try:
                 naming_result = validator.validate_naming(
                     combined_code,
-                    self.validation_spec.get("naming_conventions", {}),
+                    self._naming_conventions,
                 )
             except Exception as e:
                 errors.append(f"Naming validation error: {e}")
@@ -330,8 +359,11 @@ class AgentTest:
                     score=0.0,
                 )
 
-            # 6. Score
-            weights = self.validation_spec["scoring"]
+            compilation_result = compilation_future.result()
+            self._compile_budget.record(compilation_result.duration_sec, compilation_result.timed_out)
+
+            # 5. Score
+            weights = self._weights
             final_score = (
                 (1.0 if compilation_result.success else 0.0) * weights["compilation"]
                 + (ast_result.score / 10.0) * weights["pattern_match"]
@@ -373,12 +405,22 @@ class AgentTest:
             )
 
         finally:
-            # 7. Always restore stubs
-            self.target_file.write_text(self.original_code)
+            # 6. Restore stubs (only if the agent ran)
+            self._restore()
+
+    def close(self) -> None:
+        """Shut down the compile worker; call once after the last run."""
+        self._compile_pool.shutdown()
+
+    def _restore(self) -> None:
+        """Restore the stub files if the agent may have changed them."""
+        if self._file_state != "original":
+            atomic_write(self.target_file, self._original_bytes)
             if self._columns_file.exists() or self.original_columns:
                 self._columns_file.write_text(self.original_columns)
             if self._types_file.exists() or self.original_types:
                 self._types_file.write_text(self.original_types)
+            self._file_state = "original"
 
 
 def format_run(result: AgentBenchmarkResult) -> None:
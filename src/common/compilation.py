@@ -0,0 +1,176 @@
+"""Shared compilation helpers for benchmark runners.
+
+Provides CompileTimeoutBudget, which replaces the fixed subprocess timeout used
+for TypeScript compilation with an adaptive one derived from recent compile
+durations. A runner instance is reused across all runs of a fixture, so the
+budget pools timings over the whole run batch and aborts it when repeated
+timeouts point at a broken fixture rather than a slow model output.
+
+Also provides resolve_compile_command, which runs simple package.json scripts
+through their node_modules/.bin binary instead of `npm run`, with TypeScript
+incremental builds enabled so consecutive runs reuse the type-check state.
+"""
+
+import json
+import logging
+import shlex
+import statistics
+from collections import deque
+from pathlib import Path
+from typing import Deque, List
+
+logger = logging.getLogger(__name__)
+
+# Fixed timeout used until enough samples are collected (previous hard-coded value).
+DEFAULT_COMPILE_TIMEOUT = 60.0
+# Lower bound for the adaptive timeout.
+MIN_COMPILE_TIMEOUT = 5.0
+# Samples required before the adaptive timeout kicks in.
+MIN_SAMPLES = 8
+# Number of most recent compile durations kept.
+HISTORY_SIZE = 32
+# Consecutive timeouts after which the run batch is aborted.
+MAX_CONSECUTIVE_TIMEOUTS = 3
+# Characters sh would interpret (operators, expansion, globs, comments); such scripts go through npm.
+SHELL_SYNTAX_CHARS = "&|;<>$`*?~#(){}[]"
+# Type checkers that accept --incremental / --tsBuildInfoFile.
+INCREMENTAL_BINARIES = ("vue-tsc", "tsc")
+# Where incremental build info is kept, relative to compilation_cwd.
+TSBUILDINFO_DIR = Path("node_modules") / ".cache" / "llm-benchmark"
+
+
+class BenchmarkAborted(Exception):
+    """Raised when a run batch must stop early (e.g. repeated compilation timeouts)."""
+
+    pass
+
+
+class CompileTimeoutBudget:
+    """Adaptive compilation timeout pooled across the runs of a fixture.
+
+    timeout() returns DEFAULT_COMPILE_TIMEOUT until MIN_SAMPLES durations are
+    recorded, then max(MIN_COMPILE_TIMEOUT, 3 * p95(recent durations)).
+
+    The budget is exhausted once MAX_CONSECUTIVE_TIMEOUTS timeouts happen in a
+    row; any completed compilation resets the counter. check() then raises
+    BenchmarkAborted before the next run starts, so the run that hit the
+    threshold still returns its result.
+    """
+
+    def __init__(self, default_timeout: float = DEFAULT_COMPILE_TIMEOUT):
+        self.default_timeout = default_timeout
+        self._compile_durations: Deque[float] = deque(maxlen=HISTORY_SIZE)
+        self._consecutive_timeouts = 0
+
+    def timeout(self) -> float:
+        """Return the timeout (seconds) to use for the next compilation."""
+        if len(self._compile_durations) < MIN_SAMPLES:
+            return self.default_timeout
+        p95 = statistics.quantiles(self._compile_durations, n=20)[-1]
+        return max(MIN_COMPILE_TIMEOUT, 3 * p95)
+
+    def record(self, duration_sec: float, timed_out: bool) -> None:
+        """Record the outcome of a compilation.
+
+        Timed-out compilations are not added to the duration history (their
+        duration is just the timeout) but count towards the abort threshold.
+        """
+        if not timed_out:
+            self._compile_durations.append(duration_sec)
+            self._consecutive_timeouts = 0
+            return
+
+        self._consecutive_timeouts += 1
+        logger.warning(
+            f"Compilation timed out ({self._consecutive_timeouts}/{MAX_CONSECUTIVE_TIMEOUTS} consecutive)"
+        )
+
+    @property
+    def exhausted(self) -> bool:
+        """True once MAX_CONSECUTIVE_TIMEOUTS timeouts happened in a row."""
+        return self._consecutive_timeouts >= MAX_CONSECUTIVE_TIMEOUTS
+
+    def check(self) -> None:
+        """Call before starting a run.
+
+        Raises:
+            BenchmarkAborted: If the budget is exhausted.
+        """
+        if self.exhausted:
+            raise BenchmarkAborted(
+                f"{self._consecutive_timeouts} consecutive compilation timeouts — "
+                "fixture is likely broken"
+            )
+
+
+def resolve_compile_command(
+    compilation_command: str,
+    compilation_cwd: Path,
+    target_project: Path,
+) -> List[str]:
+    """Build the argv for the package.json script `compilation_command`.
+
+    If the script is a plain `<bin> <args...>` command and `<bin>` is found in a
+    node_modules/.bin between compilation_cwd and target_project, the binary is
+    invoked directly, skipping the npm process. Anything npm would have to
+    interpret (shell operators, expansions, globs, comments, env assignments,
+    pre/post hooks) falls back to `npm run <compilation_command>`.
+
+    Direct vue-tsc/tsc invocations also get `--incremental` with a build info
+    file under TSBUILDINFO_DIR, unless the script already configures it or runs
+    in build mode (-b/--build). Only the target file changes between runs, so
+    most type-check work is reused.
+
+    The result only depends on package.json and node_modules/.bin, so runners
+    resolve it once per fixture and reuse it for every compilation.
+
+    Args:
+        compilation_command: npm script name (e.g. 'check-types').
+        compilation_cwd: Directory holding the package.json that defines the script.
+        target_project: Upper bound for the node_modules/.bin search.
+    """
+    fallback = ["npm", "run", compilation_command]
+    # Absolute, so the build info path does not depend on the subprocess cwd
+    compilation_cwd = compilation_cwd.resolve()
+    try:
+        scripts = json.loads((compilation_cwd / "package.json").read_text()).get("scripts", {})
+    except (OSError, ValueError, AttributeError):
+        return fallback
+
+    script = scripts.get(compilation_command)
+    if not isinstance(script, str) or any(c in script for c in SHELL_SYNTAX_CHARS):
+        return fallback
+    if f"pre{compilation_command}" in scripts or f"post{compilation_command}" in scripts:
+        return fallback
+    try:
+        argv = shlex.split(script)
+    except ValueError:
+        return fallback
+    if not argv or "=" in argv[0]:
+        return fallback
+
+    root = target_project.resolve()
+    for directory in (compilation_cwd, *compilation_cwd.parents):
+        binary = directory / "node_modules" / ".bin" / argv[0]
+        if binary.is_file():
+            return [str(binary), *argv[1:], *_incremental_args(argv, compilation_command, compilation_cwd)]
+        if directory == root:
+            break
+    return fallback
+
+
+def _incremental_args(argv: List[str], compilation_command: str, compilation_cwd: Path) -> List[str]:
+    """Extra type-checker arguments enabling incremental builds (empty if n/a)."""
+    if argv[0] not in INCREMENTAL_BINARIES:
+        return []
+    if any(arg.startswith(("--incremental", "--tsBuildInfoFile")) for arg in argv[1:]):
+        return []
+    # Build mode manages its own .tsbuildinfo files
+    if any(arg in ("-b", "--build") for arg in argv[1:]):
+        return []
+    build_info_dir = compilation_cwd / TSBUILDINFO_DIR
+    try:
+        build_info_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return []
+    return ["--incremental", "--tsBuildInfoFile", str(build_info_dir / f"{compilation_command}.tsbuildinfo")]
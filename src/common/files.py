@@ -0,0 +1,19 @@
+"""File helpers shared by benchmark runners."""
+
+import os
+from pathlib import Path
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Replace `path` with `data` in a single rename.
+
+    Writes to a sibling `<name>.tmp` file and moves it over `path` with
+    os.replace, so the compiler never sees a half-written file.
+
+    Args:
+        path: File to replace.
+        data: Already-encoded file contents.
+    """
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
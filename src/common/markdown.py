@@ -0,0 +1,29 @@
+"""Markdown helpers shared by benchmark runners."""
+
+from typing import Optional
+
+
+def fenced_block(response: str, fence: str) -> Optional[str]:
+    """Return the body of the first block opened by `fence`, or None.
+
+    Equivalent to re.search(fence + r"\\s*\\n(.*?)\\n```", response, re.DOTALL).group(1),
+    using str.find instead of the regex engine.
+    """
+    start = response.find(fence)
+    while start >= 0:
+        # The opening fence must be followed by whitespace containing a newline;
+        # the body starts after the last newline of that run (greedy \s*).
+        ws_start = ws_end = start + len(fence)
+        while ws_end < len(response) and response[ws_end].isspace():
+            ws_end += 1
+        last_nl = response.rfind("\n", ws_start, ws_end)
+        if last_nl >= 0:
+            end = response.find("\n```", last_nl + 1)
+            if end >= 0:
+                return response[last_nl + 1:end]
+            # Empty block: the closing fence directly follows the whitespace run
+            prev_nl = response.rfind("\n", ws_start, last_nl)
+            if prev_nl >= 0 and last_nl == ws_end - 1 and response.startswith("```", ws_end):
+                return response[prev_nl + 1:last_nl]
+        start = response.find(fence, start + 1)
+    return None
@@ -9,15 +9,18 @@ Differences from the standard CreationTest:
 
 import json
 import logging
-import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Literal
 
 from rich.console import Console
 
 from src.common import ollama_client
+from src.common.compilation import CompileTimeoutBudget, resolve_compile_command
+from src.common.files import atomic_write
+from src.common.markdown import fenced_block
 from src.creation.nuxt_form_oneshot import validator
 from src.creation.nuxt_form_oneshot.validator import ASTResult, NamingResult
 
@@ -25,7 +28,7 @@ logger = logging.getLogger(__name__)
 console = Console()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BenchmarkResult:
     """Complete test execution result for the nuxt-form-creation fixture."""
 
@@ -90,6 +93,10 @@ class CreationTest:
         compilation_cwd_rel = self.validation_spec.get("compilation_cwd", ".")
         self._compilation_cwd = self.target_project / compilation_cwd_rel
         self._compilation_command = self.validation_spec.get("compilation_command", "type-check")
+        # Resolved once: package.json and node_modules/.bin do not change between runs
+        self._compile_argv = resolve_compile_command(
+            self._compilation_command, self._compilation_cwd, self.target_project
+        )
 
         target_file_rel = self.validation_spec["target_file"]
         self.target_file = self.target_project / target_file_rel
@@ -98,64 +105,85 @@ class CreationTest:
                 f"Target file '{target_file_rel}' not found in {self.target_project}"
             )
         self.original_code = self.target_file.read_text()
+        self._original_bytes = self.original_code.encode("utf-8")
 
         # Also save types/index.ts state (defensive: shared target_project)
         types_rel = "apps/web/src/registration/types/index.ts"
         self._types_file = self.target_project / types_rel
         self.original_types = self._types_file.read_text() if self._types_file.exists() else ""
 
+        # Validation settings, constant across runs
+        self._required_patterns = self.validation_spec.get("required_patterns", {})
+        self._naming_conventions = self.validation_spec.get("naming_conventions", {})
+        self._weights = self.validation_spec["scoring"]
+
+        # Whether the stubs on disk are pristine; lets run() skip redundant restores
+        self._file_state: Literal["original", "generated"] = "original"
+
+        # Adaptive compile timeout, pooled across all runs of this instance
+        self._compile_budget = CompileTimeoutBudget()
+        # Single worker: compilation overlaps the in-process checks, never another compile.
+        # Shut down by close() once all runs are done.
+        self._compile_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="compile")
+
     def run(self, run_number: int = 1) -> BenchmarkResult:
         """Execute single test run.
 
         Workflow:
-        1. Restore original (empty) stub
-        2. Call LLM with prompt (no template substitution)
-        3. Extract .vue code from response
-        4. Write to target file
-        5. Validate compilation (npm run check-types from apps/web)
-        6. Validate patterns (regex)
-        7. Validate naming
-        8. Calculate final score
-        9. Restore stubs (always, in finally)
+        1. Call LLM with prompt (no template substitution)
+        2. Extract .vue code from response
+        3. Write to target file
+        4. Validate compilation (npm run check-types from apps/web), in the background during 5-6
+        5. Validate patterns (regex)
+        6. Validate naming
+        7. Calculate final score
+        8. Restore stubs (in finally)
+
+        Raises:
+            BenchmarkAborted: If earlier runs exhausted the compile timeout budget.
         """
+        # Stop before calling the model once earlier runs exhausted the compile budget
+        self._compile_budget.check()
+
         timestamp = datetime.now().isoformat()
         errors: List[str] = []
 
         try:
-            # 1. Restore stub
-            self.target_file.write_text(self.original_code)
-
-            # 2. Call LLM
+            # 1. Call LLM
             chat_result = ollama_client.chat(model=self.model, prompt=self.prompt_template)
 
-            # 3. Extract .vue code
+            # 2. Extract .vue code
             output_code = self._extract_vue_code(chat_result.response_text)
 
-            # 4. Write output
-            self.target_file.write_text(output_code)
+            # 3. Write output
+            self._file_state = "generated"
+            atomic_write(self.target_file, output_code.encode("utf-8"))
 
-            # 5. Compile
-            compilation_result = validator.validate_compilation(
+            # 4. Compile in the background while the pattern and naming checks run
+            compilation_future = self._compile_pool.submit(
+                validator.validate_compilation,
                 target_project=self.target_project,
                 compilation_command=self._compilation_command,
                 compilation_cwd=self._compilation_cwd,
+                timeout=self._compile_budget.timeout(),
+                compile_argv=self._compile_argv,
             )
 
-            # 6. Pattern check
+            # 5. Pattern check
             try:
                 ast_result = validator.validate_ast_structure(
                     output_code,
-                    self.validation_spec.get("required_patterns", {}),
+                    self._required_patterns,
                 )
             except Exception as e:
                 errors.append(f"AST validation error: {e}")
                 ast_result = ASTResult(score=0.0, missing=["pattern validation failed"])
 
-            # 7. Naming check
+            # 6. Naming check
             try:
                 naming_result = validator.validate_naming(
                     output_code,
-                    self.validation_spec.get("naming_conventions", {}),
+                    self._naming_conventions,
                 )
             except Exception as e:
                 errors.append(f"Naming validation error: {e}")
@@ -165,8 +193,11 @@ class CreationTest:
                     score=0.0,
                 )
 
-            # 8. Score
-            weights = self.validation_spec["scoring"]
+            compilation_result = compilation_future.result()
+            self._compile_budget.record(compilation_result.duration_sec, compilation_result.timed_out)
+
+            # 7. Score
+            weights = self._weights
             final_score = (
                 (1.0 if compilation_result.success else 0.0) * weights["compilation"]
                 + (ast_result.score / 10.0) * weights["pattern_match"]
@@ -195,22 +226,28 @@ class CreationTest:
             )
 
         finally:
-            # 9. Always restore stubs
-            self.target_file.write_text(self.original_code)
-            if self._types_file.exists() or self.original_types:
-                self._types_file.write_text(self.original_types)
+            # 8. Restore stubs (target file only if it was overwritten)
+            self._restore()
+
+    def close(self) -> None:
+        """Shut down the compile worker; call once after the last run."""
+        self._compile_pool.shutdown()
+
+    def _restore(self) -> None:
+        """Restore the target stub if it was overwritten, and the auxiliary stubs."""
+        if self._file_state != "original":
+            atomic_write(self.target_file, self._original_bytes)
+            self._file_state = "original"
+        if self._types_file.exists() or self.original_types:
+            self._types_file.write_text(self.original_types)
 
     def _extract_vue_code(self, response: str) -> str:
         """Extract Vue SFC code from LLM response (strip markdown fences if present)."""
-        vue_fence = r"```vue\s*\n(.*?)\n```"
-        match = re.search(vue_fence, response, re.DOTALL)
-        if match:
-            return match.group(1).strip()
-
-        code_fence = r"```\s*\n(.*?)\n```"
-        match = re.search(code_fence, response, re.DOTALL)
-        if match:
-            return match.group(1).strip()
+        body = fenced_block(response, "```vue")
+        if body is None:
+            body = fenced_block(response, "```")
+        if body is not None:
+            return body.strip()
 
         return response.strip()
 
@@ -21,27 +21,36 @@ import subprocess
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+from src.common.compilation import DEFAULT_COMPILE_TIMEOUT, resolve_compile_command
 
 logger = logging.getLogger(__name__)
 
+# Prefilter for compiler output: only lines that may be errors or warnings
+_COMPILER_LINE_RE = re.compile(r"^.*(?:error TS| - error|warning).*$", re.MULTILINE | re.IGNORECASE)
+
+# Variable declarations; group 1 is set only for names that are not camelCase
+_VAR_DECL_RE = re.compile(r"\b(?:const|let|var)\s+(?:[a-z][a-zA-Z0-9_$]*|([A-Z_$][a-zA-Z0-9_$]*))")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ASTResult:
     score: float
     missing: List[str] = field(default_factory=list)
     checks: dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CompilationResult:
     success: bool
     errors: List[str]
     warnings: List[str]
     duration_sec: float
+    timed_out: bool = False
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NamingResult:
     follows_conventions: bool
     violations: List[str]
@@ -146,13 +155,22 @@ def validate_compilation(
     target_project: Path,
     compilation_command: str,
     compilation_cwd: Path,
+    timeout: float = DEFAULT_COMPILE_TIMEOUT,
+    compile_argv: Optional[List[str]] = None,
 ) -> CompilationResult:
-    """Run `npm run <compilation_command>` from `compilation_cwd`.
+    """Run the package.json script `compilation_command` from `compilation_cwd`.
+
+    Simple scripts run their node_modules/.bin binary directly; anything else
+    goes through `npm run` (see resolve_compile_command).
 
     Args:
         target_project: Root of the fixture's target_project (for existence check).
         compilation_command: npm script name (e.g. 'check-types').
         compilation_cwd: Directory from which to run npm (e.g. target_project/apps/web).
+        timeout: Subprocess timeout in seconds (see CompileTimeoutBudget). A
+            timeout below DEFAULT_COMPILE_TIMEOUT is retried once with the default.
+        compile_argv: Pre-resolved command; runners resolve it once per fixture.
+            Resolved from compilation_command when omitted.
 
     Returns:
         CompilationResult with success flag, errors, warnings, duration.
@@ -162,21 +180,24 @@ def validate_compilation(
     if not compilation_cwd.exists():
         raise FileNotFoundError(f"Compilation cwd not found: {compilation_cwd}")
 
+    if compile_argv is None:
+        compile_argv = resolve_compile_command(compilation_command, compilation_cwd, target_project)
+
     start_time = time.time()
     try:
         result = subprocess.run(
-            ["npm", "run", compilation_command],
+            compile_argv,
             cwd=compilation_cwd,
             capture_output=True,
             text=True,
-            timeout=60,
+            timeout=timeout,
         )
         duration_sec = time.time() - start_time
 
         errors = []
         warnings = []
-        for line in (result.stdout + "\n" + result.stderr).split("\n"):
-            line = line.strip()
+        for match in _COMPILER_LINE_RE.finditer(result.stdout + "\n" + result.stderr):
+            line = match.group().strip()
             if "error TS" in line or " - error" in line:
                 errors.append(line)
             elif "warning" in line.lower() and line not in warnings:
@@ -190,11 +211,22 @@ def validate_compilation(
         )
 
     except subprocess.TimeoutExpired:
+        # An adaptive timeout can cut off a slow but valid compile; only the default decides
+        if timeout < DEFAULT_COMPILE_TIMEOUT:
+            logger.warning(f"Compilation exceeded {timeout:.1f}s, retrying with {DEFAULT_COMPILE_TIMEOUT:.0f}s")
+            return validate_compilation(
+                target_project,
+                compilation_command,
+                compilation_cwd,
+                timeout=DEFAULT_COMPILE_TIMEOUT,
+                compile_argv=compile_argv,
+            )
         return CompilationResult(
             success=False,
-            errors=["Compilation timeout after 60 seconds"],
+            errors=[f"Compilation timeout after {timeout:.0f} seconds"],
             warnings=[],
             duration_sec=time.time() - start_time,
+            timed_out=True,
         )
 
 
@@ -211,16 +243,11 @@ def validate_naming(code: str, conventions: dict) -> NamingResult:
     if not conventions.get("variables"):
         return NamingResult(follows_conventions=True, violations=[], score=1.0)
 
-    var_pattern = r"\b(?:const|let|var)\s+([a-zA-Z_$][a-zA-Z0-9_$]*)"
-    names = re.findall(var_pattern, code)
-
-    if not names:
-        return NamingResult(follows_conventions=True, violations=[], score=1.0)
-
+    # camelCase declarations match with an empty group; only violations are captured
     violations = [
         f"Variable '{name}' is not camelCase (must start with lowercase letter)"
-        for name in names
-        if not name[0].islower()
+        for name in _VAR_DECL_RE.findall(code)
+        if name
     ]
 
     follows = len(violations) == 0
@@ -1,7 +1,5 @@
 """Tests for src/agent/common/agent_client.py.
 
-TDD Red phase: all tests fail until agent_client.py is implemented.
-
 smolagents API facts used here (verified against source):
 - ToolCallingAgent(tools, model, max_steps=N) — max_steps via kwarg
 - agent.run(task, return_full_result=True) → RunResult
@@ -10,14 +8,20 @@ smolagents API facts used here (verified against source):
 - agent.memory.steps: List[ActionStep]
 - ActionStep.tool_calls: List[ToolCall]  (ToolCall.name, ToolCall.arguments)
 - ActionStep.observations: str
+
+Tests share no mutable state: the smolagents stand-ins are function-scoped
+(monkeypatch) and module-level objects are only read, so the file is safe to
+run under pytest-xdist (-n auto).
 """
 
+import functools
 import os
 from types import SimpleNamespace
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import MagicMock
 
 import pytest
 
+from src.agent.common import agent_client as _ac
 from src.agent.common.agent_client import (
     AgentRunResult,
     _make_observations_prune_callback,
@@ -30,280 +34,220 @@ from src.agent.common.agent_client import (
 # Helpers: build mock smolagents objects
 # ---------------------------------------------------------------------------
 
+# These only carry plain attributes, so SimpleNamespace is enough; only the
+# agent itself needs MagicMock (call assertions on run()/the class).
+
 def _make_tool_call(name, arguments):
-    tc = MagicMock()
-    tc.name = name
-    tc.arguments = arguments
-    return tc
+    return SimpleNamespace(name=name, arguments=arguments)
 
 
 def _make_action_step(tool_name, tool_args, observation):
-    step = MagicMock()
-    step.tool_calls = [_make_tool_call(tool_name, tool_args)]
-    step.observations = observation
-    return step
+    return SimpleNamespace(tool_calls=[_make_tool_call(tool_name, tool_args)], observations=observation)
+
+
+def _make_run_result(state="success", output_tokens=150, input_tokens=400, output=None):
+    return SimpleNamespace(
+        state=state,
+        output=output,
+        token_usage=SimpleNamespace(output_tokens=output_tokens, input_tokens=input_tokens),
+    )
+
+
+# Default happy-path result; run_agent only reads it, so one instance is shared.
+_SUCCESS_RESULT = _make_run_result("success")
+
+
+def _make_mock_agent(run_result=None, steps=(), side_effect=None):
+    """Fresh ToolCallingAgent mock: run() returns run_result (success by default) or raises side_effect."""
+    agent = MagicMock()
+    if side_effect is not None:
+        agent.run.side_effect = side_effect
+    else:
+        agent.run.return_value = run_result or _SUCCESS_RESULT
+    agent.memory.steps = list(steps)
+    return agent
+
+
+# run_agent with the arguments most tests don't care about; override per call as needed.
+_run_agent = functools.partial(run_agent, model="m", task="t", tools=[], max_steps=5)
+
+# Read-only step with an observation longer than the log summary limit.
+_LONG_OBS = "x" * 500
+_LONG_STEP = _make_action_step("read_file", {}, _LONG_OBS)
+
+# Steps reused by several tests. run_agent only reads steps, so sharing them is safe;
+# the prune-callback tests, which rewrite observations, build their own.
+_STEP_COMPILE_OK = _make_action_step("run_compilation", {}, "Compilation succeeded.")
+_STEP_COMPILE_ERR = _make_action_step("run_compilation", {}, "error TS1")
+_STEP_WRITE_OK = _make_action_step("write_file", {}, "File written.\nCompilation succeeded.")
+_STEP_FINAL_ANSWER = _make_action_step("final_answer", {"answer": "Done"}, "Done")
+
+
+class _Recorder:
+    """Stand-in for a smolagents class: records constructor kwargs, returns return_value."""
+
+    def __init__(self):
+        self.kwargs = None
+        self.return_value = MagicMock()
 
+    def __call__(self, **kwargs):
+        self.kwargs = kwargs
+        return self.return_value
 
-def _make_run_result(state="success", output_tokens=150, input_tokens=400):
-    result = MagicMock()
-    result.state = state
-    result.token_usage = MagicMock()
-    result.token_usage.output_tokens = output_tokens
-    result.token_usage.input_tokens = input_tokens
-    return result
+
+@pytest.fixture(autouse=True)
+def mocks(monkeypatch):
+    """Replace the smolagents classes used by agent_client with per-test _Recorder stand-ins."""
+    agent_cls, model_cls = _Recorder(), _Recorder()
+    monkeypatch.setattr(_ac, "ToolCallingAgent", agent_cls)
+    monkeypatch.setattr(_ac, "OpenAIServerModel", model_cls)
+    return SimpleNamespace(agent_cls=agent_cls, model_cls=model_cls)
+
+
+@pytest.fixture(scope="module")
+def dummy_tools():
+    """Stand-in tool list; run_agent only forwards it, so one instance serves the module."""
+    return [MagicMock(), MagicMock()]
 
 
 # ---------------------------------------------------------------------------
 # AgentRunResult dataclass
 # ---------------------------------------------------------------------------
 
-class TestAgentRunResult:
-    def test_is_instantiable_with_required_fields(self):
-        result = AgentRunResult(
-            succeeded=True,
-            steps=2,
-            final_output="Done",
-            tool_call_log=[],
-            duration_sec=3.5,
-            tokens_per_sec=45.0,
-            errors=[],
-        )
-        assert result.succeeded is True
-        assert result.steps == 2
-        assert result.duration_sec == 3.5
-
-    def test_errors_defaults_to_empty_list(self):
-        result = AgentRunResult(
-            succeeded=True,
-            steps=1,
-            final_output="",
-            tool_call_log=[],
-            duration_sec=1.0,
-            tokens_per_sec=0.0,
-        )
-        assert result.errors == []
-
-    def test_run_crashed_defaults_to_false(self):
-        result = AgentRunResult(
-            succeeded=True,
-            steps=1,
-            final_output="Done",
-            tool_call_log=[],
-            duration_sec=1.0,
-            tokens_per_sec=0.0,
-        )
-        assert result.run_crashed is False
+@pytest.mark.parametrize("kwargs", [
+    dict(succeeded=True, steps=2, final_output="Done", tool_call_log=[],
+         duration_sec=3.5, tokens_per_sec=45.0, errors=[]),
+    dict(succeeded=True, steps=1, final_output="", tool_call_log=[],
+         duration_sec=1.0, tokens_per_sec=0.0),
+])
+def test_agent_run_result_construction(kwargs):
+    """Required fields are stored as given; errors and run_crashed have safe defaults."""
+    result = AgentRunResult(**kwargs)
+
+    assert result.succeeded is True
+    assert result.steps == kwargs["steps"]
+    assert result.duration_sec == kwargs["duration_sec"]
+    assert result.errors == []
+    assert result.run_crashed is False
 
 
 # ---------------------------------------------------------------------------
 # run_agent
 # ---------------------------------------------------------------------------
 
-class TestRunAgent:
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_returns_agent_run_result(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
+@pytest.mark.parametrize("state,expected", [("success", True), ("max_steps_error", False)])
+def test_succeeded_reflects_run_state(mocks, state, expected):
+    mocks.agent_cls.return_value = _make_mock_agent(run_result=_make_run_result(state))
 
-        result = run_agent(model="test-model", task="Fix it", tools=[], max_steps=5)
+    result = _run_agent(model="test-model", task="Fix it")
 
-        assert isinstance(result, AgentRunResult)
+    assert isinstance(result, AgentRunResult)
+    assert result.succeeded is expected
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_succeeded_true_when_state_is_success(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
 
-        result = run_agent(model="m", task="t", tools=[], max_steps=5)
+def test_succeeded_false_on_unexpected_exception(mocks):
+    mocks.agent_cls.return_value = _make_mock_agent(side_effect=RuntimeError("connection refused"))
 
-        assert result.succeeded is True
+    result = _run_agent()
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_succeeded_false_when_state_is_max_steps_error(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("max_steps_error")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
+    assert result.succeeded is False
+    assert len(result.errors) > 0
 
-        result = run_agent(model="m", task="t", tools=[], max_steps=5)
 
-        assert result.succeeded is False
+def test_tool_call_log_populated_from_memory_steps(mocks):
+    mocks.agent_cls.return_value = _make_mock_agent(steps=[
+        _make_action_step("read_file", {"path": "src/test.vue"}, "file content"),
+        _make_action_step("write_file", {"path": "src/test.vue", "content": "fixed"}, "OK"),
+    ])
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_succeeded_false_on_unexpected_exception(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.side_effect = RuntimeError("connection refused")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
+    result = _run_agent()
 
-        result = run_agent(model="m", task="t", tools=[], max_steps=5)
+    assert [(e["tool"], e["step"]) for e in result.tool_call_log] == [("read_file", 1), ("write_file", 2)]
 
-        assert result.succeeded is False
-        assert len(result.errors) > 0
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_tool_call_log_populated_from_memory_steps(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = [
-            _make_action_step("read_file", {"path": "src/test.vue"}, "file content"),
-            _make_action_step("write_file", {"path": "src/test.vue", "content": "fixed"}, "OK"),
-        ]
-        mock_agent_cls.return_value = mock_agent
-
-        result = run_agent(model="m", task="t", tools=[], max_steps=5)
-
-        assert len(result.tool_call_log) == 2
-        assert result.tool_call_log[0]["tool"] == "read_file"
-        assert result.tool_call_log[0]["step"] == 1
-        assert result.tool_call_log[1]["tool"] == "write_file"
-        assert result.tool_call_log[1]["step"] == 2
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_steps_equals_number_of_tool_calling_turns(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = [
+
+def test_run_result_numeric_fields(mocks):
+    """steps counts tool-calling turns; duration_sec and tokens_per_sec come from the run timing."""
+    mocks.agent_cls.return_value = _make_mock_agent(
+        run_result=_make_run_result("success", output_tokens=300),
+        steps=[
             _make_action_step("read_file", {}, "content"),
-            _make_action_step("run_compilation", {}, "Compilation succeeded."),
-        ]
-        mock_agent_cls.return_value = mock_agent
-
-        result = run_agent(model="m", task="t", tools=[], max_steps=5)
-
-        assert result.steps == 2
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_duration_sec_is_positive(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
-
-        result = run_agent(model="m", task="t", tools=[], max_steps=5)
-
-        assert result.duration_sec > 0
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_tokens_per_sec_computed_from_token_usage(self, mock_model_cls, mock_agent_cls):
-        """tokens_per_sec = output_tokens / duration_sec (non-zero when tokens available)."""
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success", output_tokens=300)
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
-
-        result = run_agent(model="m", task="t", tools=[], max_steps=5)
-
-        assert result.tokens_per_sec >= 0.0
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_passes_max_steps_to_agent(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
-
-        run_agent(model="m", task="t", tools=[], max_steps=3)
-
-        _, agent_kwargs = mock_agent_cls.call_args
-        assert agent_kwargs.get("max_steps") == 3
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_passes_tools_to_agent(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
-
-        dummy_tools = [MagicMock(), MagicMock()]
-        run_agent(model="m", task="t", tools=dummy_tools, max_steps=5)
-
-        _, agent_kwargs = mock_agent_cls.call_args
-        assert agent_kwargs.get("tools") == dummy_tools
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_uses_ollama_base_url_env_var(self, mock_model_cls, mock_agent_cls, monkeypatch):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
-
-        monkeypatch.setenv("OLLAMA_BASE_URL", "http://192.168.1.10:11434")
-        run_agent(model="m", task="t", tools=[], max_steps=5)
-
-        _, model_kwargs = mock_model_cls.call_args
-        assert "192.168.1.10:11434" in model_kwargs.get("api_base", "")
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_calls_run_with_return_full_result_true(self, mock_model_cls, mock_agent_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
-
-        run_agent(model="m", task="Fix it", tools=[], max_steps=5)
-
-        mock_agent.run.assert_called_once_with("Fix it", return_full_result=True)
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_tool_call_log_result_summary_truncated(self, mock_model_cls, mock_agent_cls):
-        """Long observations should be truncated in the log summary."""
-        long_obs = "x" * 500
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = [_make_action_step("read_file", {}, long_obs)]
-        mock_agent_cls.return_value = mock_agent
-
-        result = run_agent(model="m", task="t", tools=[], max_steps=5)
-
-        summary = result.tool_call_log[0]["result_summary"]
-        assert len(summary) <= 250  # truncated
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_log_extraction_error_does_not_crash(self, mock_model_cls, mock_agent_cls):
-        """If agent.memory is unavailable, result should still be returned with an error logged."""
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory = None  # accessing None.steps raises AttributeError
-        mock_agent_cls.return_value = mock_agent
-
-        result = run_agent(model="m", task="t", tools=[], max_steps=5)
-
-        assert isinstance(result, AgentRunResult)
-        assert len(result.errors) > 0
-
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_step_callbacks_passed_to_agent(self, mock_model_cls, mock_agent_cls):
-        """ToolCallingAgent must receive step_callbacks for history pruning."""
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = []
-        mock_agent_cls.return_value = mock_agent
-
-        run_agent(model="m", task="t", tools=[], max_steps=5)
-
-        _, agent_kwargs = mock_agent_cls.call_args
-        assert "step_callbacks" in agent_kwargs
-        assert len(agent_kwargs["step_callbacks"]) > 0
+            _STEP_COMPILE_OK,
+        ],
+    )
+
+    result = _run_agent()
+
+    assert result.steps == 2
+    assert result.duration_sec > 0
+    assert result.tokens_per_sec >= 0.0
+
+
+def test_passes_max_steps_to_agent(mocks):
+    mocks.agent_cls.return_value = _make_mock_agent()
+
+    _run_agent(max_steps=3)
+
+    agent_kwargs = mocks.agent_cls.kwargs
+    assert agent_kwargs.get("max_steps") == 3
+
+
+def test_passes_tools_to_agent(mocks, dummy_tools):
+    mocks.agent_cls.return_value = _make_mock_agent()
+
+    _run_agent(tools=dummy_tools)
+
+    agent_kwargs = mocks.agent_cls.kwargs
+    assert agent_kwargs.get("tools") == dummy_tools
+
+
+def test_uses_ollama_base_url_env_var(mocks, monkeypatch):
+    mocks.agent_cls.return_value = _make_mock_agent()
+
+    monkeypatch.setenv("OLLAMA_BASE_URL", "http://192.168.1.10:11434")
+    _run_agent()
+
+    model_kwargs = mocks.model_cls.kwargs
+    assert "192.168.1.10:11434" in model_kwargs.get("api_base", "")
+
+
+def test_calls_run_with_return_full_result_true(mocks):
+    mock_agent = mocks.agent_cls.return_value = _make_mock_agent()
+
+    _run_agent(task="Fix it")
+
+    mock_agent.run.assert_called_once_with("Fix it", return_full_result=True)
+
+
+def test_tool_call_log_result_summary_truncated(mocks):
+    """Long observations should be truncated in the log summary."""
+    mocks.agent_cls.return_value = _make_mock_agent(steps=[_LONG_STEP])
+
+    result = _run_agent()
+
+    summary = result.tool_call_log[0]["result_summary"]
+    assert len(summary) <= 250  # truncated
+
+
+def test_log_extraction_error_does_not_crash(mocks):
+    """If agent.memory is unavailable, result should still be returned with an error logged."""
+    mock_agent = mocks.agent_cls.return_value = _make_mock_agent()
+    mock_agent.memory = None  # accessing None.steps raises AttributeError
+
+    result = _run_agent()
+
+    assert isinstance(result, AgentRunResult)
+    assert len(result.errors) > 0
+
+
+def test_step_callbacks_passed_to_agent(mocks):
+    """ToolCallingAgent must receive step_callbacks for history pruning."""
+    mocks.agent_cls.return_value = _make_mock_agent()
+
+    _run_agent()
+
+    agent_kwargs = mocks.agent_cls.kwargs
+    assert "step_callbacks" in agent_kwargs
+    assert len(agent_kwargs["step_callbacks"]) > 0
 
 
 # ---------------------------------------------------------------------------
@@ -367,55 +311,40 @@ class TestStepDataCallback:
 # ---------------------------------------------------------------------------
 
 class TestToolCallLogEnrichment:
-    def _run_with_steps(self, steps, mock_agent_cls, mock_model_cls):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = steps
+    def _run_with_steps(self, steps, mocks):
+        mock_agent = mocks.agent_cls.return_value = _make_mock_agent(steps=steps)
         mock_agent.write_memory_to_messages.return_value = [{"role": "user", "content": "ctx"}]
-        mock_agent_cls.return_value = mock_agent
-        return run_agent(model="m", task="t", tools=[], max_steps=5)
+        return _run_agent()
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
     def test_write_file_compile_passed_is_none(
-        self, mock_model_cls, mock_agent_cls
+        self, mocks
     ):
         """write_file is no longer in _COMPILE_TOOLS — compile_passed must be None."""
         step = _make_action_step("write_file", {"path": "x.vue"}, "File written.")
-        result = self._run_with_steps([step], mock_agent_cls, mock_model_cls)
+        result = self._run_with_steps([step], mocks)
         assert result.tool_call_log[0]["compile_passed"] is None
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
     def test_tool_call_log_entry_has_compile_passed_false_for_compile_errors(
-        self, mock_model_cls, mock_agent_cls
+        self, mocks
     ):
         step = _make_action_step("run_compilation", {}, "error TS2345: bad type")
-        result = self._run_with_steps([step], mock_agent_cls, mock_model_cls)
+        result = self._run_with_steps([step], mocks)
         assert result.tool_call_log[0]["compile_passed"] is False
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
     def test_tool_call_log_entry_compile_passed_none_for_read_file(
-        self, mock_model_cls, mock_agent_cls
+        self, mocks
     ):
         step = _make_action_step("read_file", {"path": "x.vue"}, "file contents")
-        result = self._run_with_steps([step], mock_agent_cls, mock_model_cls)
+        result = self._run_with_steps([step], mocks)
         assert result.tool_call_log[0]["compile_passed"] is None
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_tool_call_log_entry_has_duration_sec(self, mock_model_cls, mock_agent_cls):
-        step = _make_action_step("write_file", {}, "File written.\nCompilation succeeded.")
-        result = self._run_with_steps([step], mock_agent_cls, mock_model_cls)
+    def test_tool_call_log_entry_has_duration_sec(self, mocks):
+        result = self._run_with_steps([_STEP_WRITE_OK], mocks)
         assert "duration_sec" in result.tool_call_log[0]
         assert result.tool_call_log[0]["duration_sec"] >= 0.0
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_tool_call_log_entry_has_context_chars(self, mock_model_cls, mock_agent_cls):
-        step = _make_action_step("write_file", {}, "File written.\nCompilation succeeded.")
-        result = self._run_with_steps([step], mock_agent_cls, mock_model_cls)
+    def test_tool_call_log_entry_has_context_chars(self, mocks):
+        result = self._run_with_steps([_STEP_WRITE_OK], mocks)
         assert "context_chars" in result.tool_call_log[0]
         assert isinstance(result.tool_call_log[0]["context_chars"], int)
 
@@ -425,88 +354,70 @@ class TestToolCallLogEnrichment:
 # ---------------------------------------------------------------------------
 
 class TestAgentRunResultAggregates:
-    def _run(self, steps, mock_agent_cls, mock_model_cls, run_result=None):
-        mock_agent = MagicMock()
-        mock_agent.run.return_value = run_result or _make_run_result("success", output_tokens=100, input_tokens=400)
-        mock_agent.memory.steps = steps
+    def _run(self, steps, mocks, run_result=None):
+        mock_agent = mocks.agent_cls.return_value = _make_mock_agent(
+            run_result=run_result or _make_run_result("success", output_tokens=100, input_tokens=400),
+            steps=steps,
+        )
         mock_agent.write_memory_to_messages.return_value = [{"role": "user", "content": "x"}]
-        mock_agent_cls.return_value = mock_agent
-        return run_agent(model="m", task="t", tools=[], max_steps=5)
+        return _run_agent()
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_total_input_tokens(self, mock_model_cls, mock_agent_cls):
-        result = self._run([], mock_agent_cls, mock_model_cls, _make_run_result("success", input_tokens=400))
+    def test_total_input_tokens(self, mocks):
+        result = self._run([], mocks, _make_run_result("success", input_tokens=400))
         assert result.total_input_tokens == 400
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_total_output_tokens(self, mock_model_cls, mock_agent_cls):
-        result = self._run([], mock_agent_cls, mock_model_cls, _make_run_result("success", output_tokens=150))
+    def test_total_output_tokens(self, mocks):
+        result = self._run([], mocks, _make_run_result("success", output_tokens=150))
         assert result.total_output_tokens == 150
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_first_compile_success_step_none_when_no_compile(self, mock_model_cls, mock_agent_cls):
-        result = self._run([], mock_agent_cls, mock_model_cls)
+    def test_first_compile_success_step_none_when_no_compile(self, mocks):
+        result = self._run([], mocks)
         assert result.first_compile_success_step is None
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_first_compile_success_step_set_on_first_success(self, mock_model_cls, mock_agent_cls):
+    def test_first_compile_success_step_set_on_first_success(self, mocks):
         """Only run_compilation calls determine compile_passed (write_file no longer in _COMPILE_TOOLS)."""
         steps = [
-            _make_action_step("run_compilation", {}, "error TS1"),
-            _make_action_step("run_compilation", {}, "Compilation succeeded."),
+            _STEP_COMPILE_ERR,
+            _STEP_COMPILE_OK,
         ]
-        result = self._run(steps, mock_agent_cls, mock_model_cls)
+        result = self._run(steps, mocks)
         assert result.first_compile_success_step == 2
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_compile_error_recovery_count(self, mock_model_cls, mock_agent_cls):
+    def test_compile_error_recovery_count(self, mocks):
         """Only run_compilation calls track compile pass/fail transitions."""
         steps = [
-            _make_action_step("run_compilation", {}, "error TS1"),
-            _make_action_step("run_compilation", {}, "Compilation succeeded."),
+            _STEP_COMPILE_ERR,
+            _STEP_COMPILE_OK,
             _make_action_step("run_compilation", {}, "error TS2"),
-            _make_action_step("run_compilation", {}, "Compilation succeeded."),
+            _STEP_COMPILE_OK,
         ]
-        result = self._run(steps, mock_agent_cls, mock_model_cls)
+        result = self._run(steps, mocks)
         assert result.compile_error_recovery_count == 2
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_rag_queries_count(self, mock_model_cls, mock_agent_cls):
+    def test_rag_queries_count(self, mocks):
         steps = [
             _make_action_step("query_rag", {"query": "how to use Form"}, "result text"),
-            _make_action_step("write_file", {}, "File written.\nCompilation succeeded."),
+            _STEP_WRITE_OK,
         ]
-        result = self._run(steps, mock_agent_cls, mock_model_cls)
+        result = self._run(steps, mocks)
         assert result.rag_queries_count == 1
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_read_file_count(self, mock_model_cls, mock_agent_cls):
+    def test_read_file_count(self, mocks):
         steps = [
             _make_action_step("read_file", {"path": "a.vue"}, "content"),
             _make_action_step("read_file", {"path": "b.vue"}, "content"),
         ]
-        result = self._run(steps, mock_agent_cls, mock_model_cls)
+        result = self._run(steps, mocks)
         assert result.read_file_count == 2
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_list_files_count(self, mock_model_cls, mock_agent_cls):
+    def test_list_files_count(self, mocks):
         steps = [_make_action_step("list_files", {"directory": "."}, "file1\nfile2")]
-        result = self._run(steps, mock_agent_cls, mock_model_cls)
+        result = self._run(steps, mocks)
         assert result.list_files_count == 1
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_counts_zero_when_tools_not_used(self, mock_model_cls, mock_agent_cls):
-        steps = [_make_action_step("write_file", {}, "File written.\nCompilation succeeded.")]
-        result = self._run(steps, mock_agent_cls, mock_model_cls)
+    def test_counts_zero_when_tools_not_used(self, mocks):
+        steps = [_STEP_WRITE_OK]
+        result = self._run(steps, mocks)
         assert result.rag_queries_count == 0
         assert result.read_file_count == 0
         assert result.list_files_count == 0
@@ -595,63 +506,46 @@ class TestObservationsPruneCallback:
 # ---------------------------------------------------------------------------
 
 class TestRunCrashedAndFinalAnswer:
-    def _run_with_steps(self, steps, mock_agent_cls, mock_model_cls, side_effect=None):
-        mock_agent = MagicMock()
-        if side_effect is not None:
-            mock_agent.run.side_effect = side_effect
-        else:
-            mock_agent.run.return_value = _make_run_result("success")
-        mock_agent.memory.steps = steps
+    def _run_with_steps(self, steps, mocks, side_effect=None):
+        mock_agent = mocks.agent_cls.return_value = _make_mock_agent(steps=steps, side_effect=side_effect)
         mock_agent.write_memory_to_messages.return_value = [{"role": "user", "content": "ctx"}]
-        mock_agent_cls.return_value = mock_agent
-        return run_agent(model="m", task="t", tools=[], max_steps=5)
+        return _run_agent()
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_run_crashed_set_on_agent_exception(self, mock_model_cls, mock_agent_cls):
+    def test_run_crashed_set_on_agent_exception(self, mocks):
         """run_crashed must be True when agent.run() raises an exception."""
         result = self._run_with_steps(
-            [], mock_agent_cls, mock_model_cls,
+            [], mocks,
             side_effect=RuntimeError("Ollama 500 error")
         )
         assert result.run_crashed is True
         assert result.succeeded is False
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_run_crashed_false_on_success(self, mock_model_cls, mock_agent_cls):
+    def test_run_crashed_false_on_success(self, mocks):
         """run_crashed must be False on a normal successful run."""
-        result = self._run_with_steps([], mock_agent_cls, mock_model_cls)
+        result = self._run_with_steps([], mocks)
         assert result.run_crashed is False
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_final_answer_in_tool_call_log(self, mock_model_cls, mock_agent_cls):
+    def test_final_answer_in_tool_call_log(self, mocks):
         """final_answer tool call must appear in tool_call_log."""
-        step = _make_action_step("final_answer", {"answer": "Done"}, "Done")
-        result = self._run_with_steps([step], mock_agent_cls, mock_model_cls)
+        result = self._run_with_steps([_STEP_FINAL_ANSWER], mocks)
         tools_called = [e["tool"] for e in result.tool_call_log]
         assert "final_answer" in tools_called
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_final_answer_not_counted_in_step_count(self, mock_model_cls, mock_agent_cls):
+    def test_final_answer_not_counted_in_step_count(self, mocks):
         """A step with ONLY final_answer must NOT increment step_count."""
-        step = _make_action_step("final_answer", {"answer": "Done"}, "Done")
-        result = self._run_with_steps([step], mock_agent_cls, mock_model_cls)
+        result = self._run_with_steps([_STEP_FINAL_ANSWER], mocks)
         assert result.steps == 0
 
-    @patch("src.agent.common.agent_client.ToolCallingAgent")
-    @patch("src.agent.common.agent_client.OpenAIServerModel")
-    def test_final_answer_after_real_tool_still_one_step(self, mock_model_cls, mock_agent_cls):
+    def test_final_answer_after_real_tool_still_one_step(self, mocks):
         """A step with write_file + final_answer counts as 1 step (not 0, not 2)."""
-        step = MagicMock()
-        step.tool_calls = [
-            _make_tool_call("write_file", {"path": "x.vue", "content": "code"}),
-            _make_tool_call("final_answer", {"answer": "Done"}),
-        ]
-        step.observations = "File written."
-        result = self._run_with_steps([step], mock_agent_cls, mock_model_cls)
+        step = SimpleNamespace(
+            tool_calls=[
+                _make_tool_call("write_file", {"path": "x.vue", "content": "code"}),
+                _make_tool_call("final_answer", {"answer": "Done"}),
+            ],
+            observations="File written.",
+        )
+        result = self._run_with_steps([step], mocks)
         assert result.steps == 1
         tools_logged = [e["tool"] for e in result.tool_call_log]
         assert "write_file" in tools_logged
@@ -0,0 +1,139 @@
+"""Tests for src/common/compilation.py — compile timeout budget and command resolution."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.common.compilation import (
+    DEFAULT_COMPILE_TIMEOUT,
+    MAX_CONSECUTIVE_TIMEOUTS,
+    MIN_COMPILE_TIMEOUT,
+    MIN_SAMPLES,
+    BenchmarkAborted,
+    CompileTimeoutBudget,
+    resolve_compile_command,
+)
+
+
+class TestCompileTimeoutBudget:
+    def test_default_timeout_before_enough_samples(self):
+        budget = CompileTimeoutBudget()
+        for _ in range(MIN_SAMPLES - 1):
+            budget.record(2.0, timed_out=False)
+        assert budget.timeout() == DEFAULT_COMPILE_TIMEOUT
+
+    def test_adaptive_timeout_is_three_times_p95(self):
+        budget = CompileTimeoutBudget()
+        for _ in range(MIN_SAMPLES):
+            budget.record(4.0, timed_out=False)
+        assert budget.timeout() == pytest.approx(12.0)
+
+    def test_adaptive_timeout_has_floor(self):
+        budget = CompileTimeoutBudget()
+        for _ in range(MIN_SAMPLES):
+            budget.record(0.1, timed_out=False)
+        assert budget.timeout() == MIN_COMPILE_TIMEOUT
+
+    def test_timeouts_not_added_to_history(self):
+        budget = CompileTimeoutBudget()
+        for _ in range(MIN_SAMPLES - 1):
+            budget.record(2.0, timed_out=False)
+        budget.record(60.0, timed_out=True)
+        assert budget.timeout() == DEFAULT_COMPILE_TIMEOUT
+
+    def test_aborts_after_consecutive_timeouts(self):
+        budget = CompileTimeoutBudget()
+        for _ in range(MAX_CONSECUTIVE_TIMEOUTS - 1):
+            budget.record(60.0, timed_out=True)
+        budget.check()
+        # Recording the last timeout never raises: the run that hit it keeps its result
+        budget.record(60.0, timed_out=True)
+        assert budget.exhausted
+        with pytest.raises(BenchmarkAborted):
+            budget.check()
+
+    def test_successful_compile_resets_timeout_counter(self):
+        budget = CompileTimeoutBudget()
+        for _ in range(MAX_CONSECUTIVE_TIMEOUTS - 1):
+            budget.record(60.0, timed_out=True)
+        budget.record(2.0, timed_out=False)
+        for _ in range(MAX_CONSECUTIVE_TIMEOUTS - 1):
+            budget.record(60.0, timed_out=True)
+        # Counting restarted at the successful compile: only the next timeout aborts
+        budget.check()
+        budget.record(60.0, timed_out=True)
+        with pytest.raises(BenchmarkAborted):
+            budget.check()
+
+
+def _make_project(tmp_path, scripts, bin_name="vue-tsc"):
+    """target_project with apps/web/package.json and a hoisted node_modules/.bin binary."""
+    web = tmp_path / "apps" / "web"
+    web.mkdir(parents=True)
+    (web / "package.json").write_text(json.dumps({"scripts": scripts}))
+    if bin_name:
+        bin_dir = tmp_path / "node_modules" / ".bin"
+        bin_dir.mkdir(parents=True)
+        (bin_dir / bin_name).write_text("#!/usr/bin/env node\n")
+    return web
+
+
+class TestResolveCompileCommand:
+    def test_runs_binary_directly(self, tmp_path):
+        web = _make_project(tmp_path, {"check-types": "vue-tsc --noEmit -p tsconfig.app.json"})
+        argv = resolve_compile_command("check-types", web, tmp_path)
+        assert argv[:4] == [
+            str((tmp_path / "node_modules" / ".bin" / "vue-tsc").resolve()),
+            "--noEmit", "-p", "tsconfig.app.json",
+        ]
+
+    def test_enables_incremental_build(self, tmp_path):
+        web = _make_project(tmp_path, {"check-types": "vue-tsc --noEmit"})
+        argv = resolve_compile_command("check-types", web, tmp_path)
+        build_info = web.resolve() / "node_modules" / ".cache" / "llm-benchmark" / "check-types.tsbuildinfo"
+        assert argv[2:] == ["--incremental", "--tsBuildInfoFile", str(build_info)]
+        assert build_info.parent.is_dir()
+
+    def test_keeps_existing_incremental_config(self, tmp_path):
+        web = _make_project(tmp_path, {"check-types": "vue-tsc --noEmit --incremental"})
+        assert "--tsBuildInfoFile" not in resolve_compile_command("check-types", web, tmp_path)
+
+    @pytest.mark.parametrize("script", ["tsc -b", "vue-tsc --build tsconfig.json"])
+    def test_no_incremental_in_build_mode(self, tmp_path, script):
+        web = _make_project(tmp_path, {"check-types": script}, bin_name=script.split()[0])
+        assert "--tsBuildInfoFile" not in resolve_compile_command("check-types", web, tmp_path)
+
+    def test_build_info_path_is_absolute_for_relative_cwd(self, tmp_path, monkeypatch):
+        _make_project(tmp_path, {"check-types": "vue-tsc --noEmit"})
+        monkeypatch.chdir(tmp_path)
+        argv = resolve_compile_command("check-types", Path("apps/web"), tmp_path)
+        assert Path(argv[-1]).is_absolute()
+
+    def test_no_incremental_for_other_binaries(self, tmp_path):
+        web = _make_project(tmp_path, {"check-types": "eslint ."}, bin_name="eslint")
+        assert resolve_compile_command("check-types", web, tmp_path)[1:] == ["."]
+
+    def test_falls_back_without_package_json(self, tmp_path):
+        assert resolve_compile_command("check-types", tmp_path, tmp_path) == ["npm", "run", "check-types"]
+
+    def test_falls_back_when_binary_missing(self, tmp_path):
+        web = _make_project(tmp_path, {"check-types": "vue-tsc --noEmit"}, bin_name=None)
+        assert resolve_compile_command("check-types", web, tmp_path) == ["npm", "run", "check-types"]
+
+    @pytest.mark.parametrize("script", [
+        "vue-tsc --noEmit && eslint .",
+        "NODE_ENV=test vue-tsc --noEmit",
+        "vue-tsc $FLAGS",
+        "vue-tsc --noEmit src/*.ts",
+        "vue-tsc -p ~/tsconfig.json",
+        "vue-tsc --noEmit # type check only",
+        "vue-tsc -p tsconfig.{app,node}.json",
+    ])
+    def test_falls_back_for_shell_scripts(self, tmp_path, script):
+        web = _make_project(tmp_path, {"check-types": script})
+        assert resolve_compile_command("check-types", web, tmp_path) == ["npm", "run", "check-types"]
+
+    def test_falls_back_when_pre_hook_defined(self, tmp_path):
+        web = _make_project(tmp_path, {"check-types": "vue-tsc --noEmit", "precheck-types": "echo hi"})
+        assert resolve_compile_command("check-types", web, tmp_path) == ["npm", "run", "check-types"]
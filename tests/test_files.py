@@ -0,0 +1,16 @@
+"""Tests for src/common/files.py."""
+
+from src.common.files import atomic_write
+
+
+class TestAtomicWrite:
+    def test_replaces_content(self, tmp_path):
+        target = tmp_path / "Form.vue"
+        target.write_text("old")
+        atomic_write(target, "<template>é</template>".encode("utf-8"))
+        assert target.read_text(encoding="utf-8") == "<template>é</template>"
+
+    def test_leaves_no_temp_file(self, tmp_path):
+        target = tmp_path / "Form.vue"
+        atomic_write(target, b"x")
+        assert [p.name for p in tmp_path.iterdir()] == ["Form.vue"]
@@ -0,0 +1,29 @@
+"""Tests for src/common/markdown.py."""
+
+import re
+
+import pytest
+
+from src.common.markdown import fenced_block
+
+
+@pytest.mark.parametrize("fence, pattern", [
+    ("```vue", r"```vue\s*\n(.*?)\n```"),
+    ("```", r"```\s*\n(.*?)\n```"),
+])
+@pytest.mark.parametrize("response", [
+    "",
+    "no fence at all",
+    "```vue\n<template/>\n```",
+    "text\n```vue  \n\n<template/>\n```\nmore",
+    "```vue<template/>\n```",
+    "```vue\n\n```",
+    "```vue\n\n```\nfoo\n```",
+    "```ts\nconst a = 1\n```\n```\n<template/>\n```",
+    "````\nx\n````",
+    "```vue\n<template/>",
+])
+def test_fenced_block_matches_regex(response, fence, pattern):
+    """fenced_block must return exactly what the previous regex captured."""
+    match = re.search(pattern, response, re.DOTALL)
+    assert fenced_block(response, fence) == (match.group(1) if match else None)
@@ -15,7 +15,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.agent.nuxt_dt_agent_full.test_runner import AgentBenchmarkResult, AgentTest
+from src.agent.nuxt_dt_agent_full.test_runner import AgentBenchmarkResult, AgentTest, _make_tools
 
 STUB_VUE = "<!-- TODO: implement OrdersDataTable component -->\n"
 STUB_COLUMNS = "// TODO: implement column definitions for OrdersDataTable\n"
@@ -89,7 +89,7 @@ def _make_agent_result(**kwargs):
 
 
 def _make_compilation_result(success=True, errors=None, warnings=None):
-    return SimpleNamespace(success=success, errors=errors or [], warnings=warnings or [])
+    return SimpleNamespace(success=success, errors=errors or [], warnings=warnings or [], duration_sec=1.0, timed_out=False)
 
 
 def _make_ast_result(score=10.0, missing=None, checks=None):
@@ -399,8 +399,6 @@ class TestWriteFileDecoupled:
 
     def test_write_file_returns_file_written_only(self, tmp_path):
         """After decoupling, write_file must return 'File written.' with no compilation output."""
-        from src.agent.nuxt_dt_agent_full.test_runner import _make_tools
-
         allowed_path = "apps/web/src/orders/OrdersDataTable.vue"
         orders_dir = tmp_path / "apps" / "web" / "src" / "orders"
         orders_dir.mkdir(parents=True, exist_ok=True)
@@ -22,6 +22,7 @@ from src.agent.nuxt_dt_agent_rag.validator import (
     validate_compilation,
     validate_naming,
 )
+from src.common.compilation import DEFAULT_COMPILE_TIMEOUT
 
 COMPLETE_COMPONENT = """
 <script setup lang="ts">
@@ -201,6 +202,28 @@ class TestValidateCompilation:
             m.return_value = MagicMock(returncode=0, stdout="", stderr="")
             assert isinstance(validate_compilation(tmp_path, "check-types", tmp_path), CompilationResult)
 
+    def test_timeout_returns_timed_out_failure(self, tmp_path):
+        with patch("subprocess.run", side_effect=subprocess.TimeoutExpired(cmd="npm", timeout=5)):
+            result = validate_compilation(tmp_path, "check-types", tmp_path, timeout=5)
+        assert result.success is False
+        assert result.timed_out is True
+
+    def test_passes_timeout_and_argv_to_subprocess(self, tmp_path):
+        with patch("subprocess.run") as m:
+            m.return_value = MagicMock(returncode=0, stdout="", stderr="")
+            result = validate_compilation(tmp_path, "check-types", tmp_path, timeout=12.5, compile_argv=["vue-tsc", "--noEmit"])
+        assert m.call_args.args[0] == ["vue-tsc", "--noEmit"]
+        assert m.call_args.kwargs["timeout"] == 12.5
+        assert result.timed_out is False
+
+    def test_short_timeout_retried_with_default(self, tmp_path):
+        ok = MagicMock(returncode=0, stdout="", stderr="")
+        with patch("subprocess.run", side_effect=[subprocess.TimeoutExpired(cmd="vue-tsc", timeout=5), ok]) as m:
+            result = validate_compilation(tmp_path, "check-types", tmp_path, timeout=5, compile_argv=["vue-tsc", "--noEmit"])
+        assert [c.kwargs["timeout"] for c in m.call_args_list] == [5, DEFAULT_COMPILE_TIMEOUT]
+        assert result.success is True
+        assert result.timed_out is False
+
 
 class TestValidateNaming:
 
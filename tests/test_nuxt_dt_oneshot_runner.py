@@ -97,7 +97,7 @@ def _make_chat_result(response="```vue\n" + COMPLETE_VUE + "\n```"):
 
 
 def _make_compilation_result(success=True, errors=None, warnings=None):
-    return SimpleNamespace(success=success, errors=errors or [], warnings=warnings or [], duration_sec=1.0)
+    return SimpleNamespace(success=success, errors=errors or [], warnings=warnings or [], duration_sec=1.0, timed_out=False)
 
 
 def _make_ast_result(score=10.0, missing=None, checks=None):
@@ -7,13 +7,23 @@ Key differences from veevalidate_zod_form agent runner:
 """
 
 import json
+import shutil
+from dataclasses import asdict, fields, replace
 from pathlib import Path
-from types import SimpleNamespace
-from unittest.mock import MagicMock, patch
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 
-from src.agent.nuxt_form_agent_full.test_runner import AgentBenchmarkResult, AgentTest
+from src.agent.common.agent_client import AgentRunResult
+from src.common.compilation import (
+    DEFAULT_COMPILE_TIMEOUT,
+    MAX_CONSECUTIVE_TIMEOUTS,
+    MIN_SAMPLES,
+    BenchmarkAborted,
+)
+from src.agent.nuxt_form_agent_full.test_runner import AgentBenchmarkResult, AgentTest, _make_tools
+from src.agent.nuxt_form_agent_full.validator import ASTResult, CompilationResult, NamingResult
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -45,7 +55,8 @@ const actions = { onSubmit: async (v: Values) => v };
 </template>
 """
 
-DEFAULT_SPEC = {
+# Read-only so a test cannot mutate the spec shared by the whole module.
+DEFAULT_SPEC = MappingProxyType({
     "target_file": "apps/web/src/registration/components/RegistrationForm.vue",
     "allowed_write_paths": [
         "apps/web/src/registration/components/RegistrationForm.vue",
@@ -65,130 +76,163 @@ DEFAULT_SPEC = {
     },
     "naming_conventions": {"variables": "camelCase"},
     "scoring": {"compilation": 0.5, "pattern_match": 0.4, "naming": 0.1},
-}
+})
+_COMPACT = (",", ":")
+_DEFAULT_SPEC_JSON = json.dumps(dict(DEFAULT_SPEC), separators=_COMPACT)
+
+# Fixture file contents, encoded once for write_bytes.
+_PROMPT_BYTES = b"Implement a registration form using the elements library."
+_DEFAULT_SPEC_BYTES = _DEFAULT_SPEC_JSON.encode("utf-8")
+_STUB_VUE_BYTES = STUB_VUE.encode("utf-8")
+_STUB_TYPES_BYTES = STUB_TYPES.encode("utf-8")
 
 
 def _make_fixture(tmp_path: Path, spec=None) -> Path:
     fixture_path = tmp_path / "veevalidate-zod-form-nuxt-rag"
-    fixture_path.mkdir()
 
-    (fixture_path / "prompt.md").write_text("Implement a registration form using the elements library.")
+    # target_project with both stub files; the deep mkdir also creates fixture_path
+    registration_dir = fixture_path / "target_project" / "apps" / "web" / "src" / "registration"
+    comp_dir = registration_dir / "components"
+    comp_dir.mkdir(parents=True)
+    (comp_dir / "RegistrationForm.vue").write_bytes(_STUB_VUE_BYTES)
+
+    types_dir = registration_dir / "types"
+    types_dir.mkdir()
+    (types_dir / "index.ts").write_bytes(_STUB_TYPES_BYTES)
+
+    (fixture_path / "prompt.md").write_bytes(_PROMPT_BYTES)
 
-    target_spec = spec if spec is not None else DEFAULT_SPEC
-    (fixture_path / "validation_spec.json").write_text(json.dumps(target_spec))
+    payload = _DEFAULT_SPEC_BYTES if spec is None else json.dumps(spec, separators=_COMPACT).encode("utf-8")
+    (fixture_path / "validation_spec.json").write_bytes(payload)
 
     # Minimal rag_docs
     rag_docs = fixture_path / "rag_docs"
     rag_docs.mkdir()
-    (rag_docs / "01_basic_form.vue").write_text("<!-- basic form example -->")
+    (rag_docs / "01_basic_form.vue").write_bytes(b"<!-- basic form example -->")
 
-    # target_project with both stub files
-    target_project = fixture_path / "target_project"
-    comp_dir = target_project / "apps" / "web" / "src" / "registration" / "components"
-    comp_dir.mkdir(parents=True)
-    (comp_dir / "RegistrationForm.vue").write_text(STUB_VUE)
+    return fixture_path
 
-    types_dir = target_project / "apps" / "web" / "src" / "registration" / "types"
-    types_dir.mkdir(parents=True)
-    (types_dir / "index.ts").write_text(STUB_TYPES)
 
-    return fixture_path
+@pytest.fixture(scope="session")
+def _fixture_template(tmp_path_factory) -> Path:
+    """Default fixture tree, built once per session; tests get a copy via fixture_path."""
+    return _make_fixture(tmp_path_factory.mktemp("template"))
+
+
+@pytest.fixture
+def fixture_path(_fixture_template, tmp_path) -> Path:
+    """Per-test copy of the default fixture tree, safe to modify."""
+    return Path(shutil.copytree(_fixture_template, tmp_path / _fixture_template.name))
+
+
+# Test doubles use the real result types (validator results are slotted, frozen
+# dataclasses) so a field rename in src/ breaks these helpers instead of passing silently.
+_AGENT_DEFAULTS = dict(
+    succeeded=True, steps=5, final_output="Done",
+    tool_call_log=[{"step": 1, "tool": "write_file", "args": {}, "result_summary": "written"}],
+    duration_sec=10.0, tokens_per_sec=20.0, errors=[],
+    total_input_tokens=600, total_output_tokens=250,
+    first_compile_success_step=1, compile_error_recovery_count=0,
+    rag_queries_count=1, read_file_count=2, list_files_count=1,
+    run_crashed=False,
+)
 
 
 def _make_agent_result(**kwargs):
-    defaults = dict(
-        succeeded=True, steps=5, final_output="Done",
-        tool_call_log=[{"step": 1, "tool": "write_file", "args": {}, "result_summary": "written"}],
-        duration_sec=10.0, tokens_per_sec=20.0, errors=[],
-        total_input_tokens=600, total_output_tokens=250,
-        first_compile_success_step=1, compile_error_recovery_count=0,
-        rag_queries_count=1, read_file_count=2, list_files_count=1,
-        run_crashed=False,
-    )
-    defaults.update(kwargs)
-    return SimpleNamespace(**defaults)
+    return AgentRunResult(**{**_AGENT_DEFAULTS, **kwargs})
 
 
 def _make_compilation_result(success=True, errors=None, warnings=None):
-    return SimpleNamespace(success=success, errors=errors or [], warnings=warnings or [])
+    return CompilationResult(success=success, errors=errors or [], warnings=warnings or [], duration_sec=1.0)
 
 
 def _make_ast_result(score=10.0, missing=None, checks=None):
-    return SimpleNamespace(
+    return ASTResult(
         score=score, missing=missing or [],
         checks=checks or {"script_lang": True, "form_component": True, "zod_schema": True},
     )
 
 
 def _make_naming_result(score=1.0, violations=None):
-    return SimpleNamespace(score=score, violations=violations or [])
+    return NamingResult(follows_conventions=not violations, violations=violations or [], score=score)
+
+
+# Default results, shared between tests: the runner only reads them.
+_DEFAULT_AGENT_RESULT = _make_agent_result()
+_DEFAULT_COMPILATION_RESULT = _make_compilation_result()
+_DEFAULT_AST_RESULT = _make_ast_result()
+_DEFAULT_NAMING_RESULT = _make_naming_result()
+
+
+@pytest.fixture
+def mocks(monkeypatch):
+    """Patch run_agent and validator in the runner; both default to a successful run."""
+    run_agent, validator = MagicMock(), MagicMock()
+    run_agent.return_value = _DEFAULT_AGENT_RESULT
+    validator.validate_compilation.return_value = _DEFAULT_COMPILATION_RESULT
+    validator.validate_ast_structure.return_value = _DEFAULT_AST_RESULT
+    validator.validate_naming.return_value = _DEFAULT_NAMING_RESULT
+    monkeypatch.setattr("src.agent.nuxt_form_agent_full.test_runner.run_agent", run_agent)
+    monkeypatch.setattr("src.agent.nuxt_form_agent_full.test_runner.validator", validator)
+    return SimpleNamespace(run_agent=run_agent, validator=validator)
 
 
 # ---------------------------------------------------------------------------
 # AgentBenchmarkResult
 # ---------------------------------------------------------------------------
 
+_BASE_RESULT_KWARGS = dict(
+    model="m", fixture="f", timestamp="t", run_number=1,
+    compiles=True, compilation_errors=[], compilation_warnings=[],
+    pattern_score=10.0, ast_missing=[], ast_checks={},
+    naming_score=10.0, naming_violations=[], final_score=10.0,
+    scoring_weights={}, tokens_per_sec=0.0, duration_sec=1.0,
+    output_code="", errors=[], steps=5, max_steps=30, iterations=2,
+    succeeded=True, tool_call_log=[], aborted=False,
+)
+
+
 class TestAgentBenchmarkResult:
 
     def test_all_fields_present(self):
-        result = AgentBenchmarkResult(
-            model="m", fixture="f", timestamp="t", run_number=1,
-            compiles=True, compilation_errors=[], compilation_warnings=[],
-            pattern_score=10.0, ast_missing=[], ast_checks={},
-            naming_score=10.0, naming_violations=[], final_score=10.0,
-            scoring_weights={}, tokens_per_sec=0.0, duration_sec=1.0,
-            output_code="", errors=[], steps=5, max_steps=30, iterations=2,
-            succeeded=True, tool_call_log=[], aborted=False,
-        )
+        assert {"steps", "max_steps", "iterations", "aborted"} <= {f.name for f in fields(AgentBenchmarkResult)}
+        result = AgentBenchmarkResult(**_BASE_RESULT_KWARGS)
         assert result.steps == 5
         assert result.max_steps == 30
         assert result.iterations == 2
         assert result.aborted is False
 
     def test_json_serialisable(self):
-        result = AgentBenchmarkResult(
-            model="m", fixture="f", timestamp="t", run_number=1,
-            compiles=True, compilation_errors=[], compilation_warnings=[],
-            pattern_score=10.0, ast_missing=[], ast_checks={},
-            naming_score=10.0, naming_violations=[], final_score=10.0,
-            scoring_weights={}, tokens_per_sec=0.0, duration_sec=1.0,
-            output_code="", errors=[], steps=5, max_steps=30, iterations=2,
-            succeeded=True, tool_call_log=[], aborted=False,
-        )
-        dumped = json.dumps(result.__dict__)
-        assert "steps" in dumped
-        assert "max_steps" in dumped
-        assert "aborted" in dumped
+        result = AgentBenchmarkResult(**_BASE_RESULT_KWARGS)
+        assert json.loads(json.dumps(asdict(result))) == asdict(result)
 
 
 # ---------------------------------------------------------------------------
 # AgentTest init
 # ---------------------------------------------------------------------------
 
+@pytest.fixture(scope="class")
+def default_agent_test(_fixture_template):
+    """One AgentTest over the default fixture; init only reads it, so the class shares it."""
+    return AgentTest(model="test-model", fixture_path=_fixture_template)
+
+
 class TestAgentTestInit:
 
-    def test_loads_prompt_and_spec(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        test = AgentTest(model="test-model", fixture_path=fixture_path)
-        assert "registration form" in test.prompt.lower()
-        assert test.validation_spec["target_file"].endswith("RegistrationForm.vue")
+    def test_loads_prompt_and_spec(self, default_agent_test):
+        assert "registration form" in default_agent_test.prompt.lower()
+        assert default_agent_test.validation_spec["target_file"].endswith("RegistrationForm.vue")
 
-    def test_reads_max_steps(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        test = AgentTest(model="test-model", fixture_path=fixture_path)
-        assert test.max_steps == 30
+    def test_reads_max_steps(self, default_agent_test):
+        assert default_agent_test.max_steps == 30
 
-    def test_reads_allowed_paths(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        test = AgentTest(model="test-model", fixture_path=fixture_path)
-        assert any("RegistrationForm.vue" in p for p in test.allowed_paths)
-        assert any("types/index.ts" in p for p in test.allowed_paths)
+    def test_reads_allowed_paths(self, default_agent_test):
+        assert any("RegistrationForm.vue" in p for p in default_agent_test.allowed_paths)
+        assert any("types/index.ts" in p for p in default_agent_test.allowed_paths)
 
-    def test_stores_original_stub_content_for_both_files(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        test = AgentTest(model="test-model", fixture_path=fixture_path)
-        assert test.original_code == STUB_VUE
-        assert test.original_types == STUB_TYPES
+    def test_stores_original_stub_content_for_both_files(self, default_agent_test):
+        assert default_agent_test.original_code == STUB_VUE
+        assert default_agent_test.original_types == STUB_TYPES
 
     def test_raises_on_missing_prompt(self, tmp_path):
         fixture_path = tmp_path / "broken"
@@ -203,15 +247,12 @@ class TestAgentTestInit:
         with pytest.raises(FileNotFoundError, match="validation_spec.json"):
             AgentTest(model="m", fixture_path=fixture_path)
 
-    def test_raises_on_missing_rag_docs(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        import shutil
+    def test_raises_on_missing_rag_docs(self, fixture_path):
         shutil.rmtree(fixture_path / "rag_docs")
         with pytest.raises(FileNotFoundError, match="rag_docs"):
             AgentTest(model="m", fixture_path=fixture_path)
 
-    def test_raises_on_missing_target_file(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
+    def test_raises_on_missing_target_file(self, fixture_path):
         target = fixture_path / "target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
         target.unlink()
         with pytest.raises(FileNotFoundError):
@@ -224,87 +265,75 @@ class TestAgentTestInit:
 
 class TestAgentTestRun:
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_returns_agent_benchmark_result(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.return_value = _make_ast_result()
-        mock_validator.validate_naming.return_value = _make_naming_result()
-
+    def test_returns_agent_benchmark_result(self, mocks, fixture_path):
         test = AgentTest(model="test-model", fixture_path=fixture_path)
         result = test.run(run_number=1)
         assert isinstance(result, AgentBenchmarkResult)
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_perfect_score_when_all_pass(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result(success=True)
-        mock_validator.validate_ast_structure.return_value = _make_ast_result(score=10.0)
-        mock_validator.validate_naming.return_value = _make_naming_result(score=1.0)
+    def test_perfect_score_when_all_pass(self, mocks, fixture_path):
+        mocks.validator.validate_compilation.return_value = _make_compilation_result(success=True)
+        mocks.validator.validate_ast_structure.return_value = _make_ast_result(score=10.0)
+        mocks.validator.validate_naming.return_value = _make_naming_result(score=1.0)
 
         result = AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
         assert result.final_score == pytest.approx(10.0)
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_zero_score_when_all_fail(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result(success=False)
-        mock_validator.validate_ast_structure.return_value = _make_ast_result(score=0.0)
-        mock_validator.validate_naming.return_value = _make_naming_result(score=0.0)
+    def test_zero_score_when_all_fail(self, mocks, fixture_path):
+        mocks.validator.validate_compilation.return_value = _make_compilation_result(success=False)
+        mocks.validator.validate_ast_structure.return_value = _make_ast_result(score=0.0)
+        mocks.validator.validate_naming.return_value = _make_naming_result(score=0.0)
 
         result = AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
         assert result.final_score == pytest.approx(0.0)
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_weighted_scoring(self, mock_run_agent, mock_validator, tmp_path):
+    def test_weighted_scoring(self, mocks, fixture_path):
         """compile(1.0)*0.5 + pattern(0.5)*0.4 + naming(0.0)*0.1 = 0.7 → 7.0"""
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result(success=True)
-        mock_validator.validate_ast_structure.return_value = _make_ast_result(score=5.0)
-        mock_validator.validate_naming.return_value = _make_naming_result(score=0.0)
+        mocks.validator.validate_compilation.return_value = _make_compilation_result(success=True)
+        mocks.validator.validate_ast_structure.return_value = _make_ast_result(score=5.0)
+        mocks.validator.validate_naming.return_value = _make_naming_result(score=0.0)
 
         result = AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
         assert result.final_score == pytest.approx(7.0)
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_both_stubs_restored_after_run(self, mock_run_agent, mock_validator, tmp_path):
+    def test_both_stubs_restored_after_run(self, mocks, fixture_path):
         """Both RegistrationForm.vue and types/index.ts must revert to stubs."""
-        fixture_path = _make_fixture(tmp_path)
         target_vue = fixture_path / "target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
         target_ts = fixture_path / "target_project" / "apps" / "web" / "src" / "registration" / "types" / "index.ts"
 
         def side_effect(*args, **kwargs):
             target_vue.write_text(COMPLETE_VUE)
             target_ts.write_text("export const x = 1;")
-            return _make_agent_result()
+            return _DEFAULT_AGENT_RESULT
 
-        mock_run_agent.side_effect = side_effect
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.return_value = _make_ast_result()
-        mock_validator.validate_naming.return_value = _make_naming_result()
+        mocks.run_agent.side_effect = side_effect
 
         AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
 
         assert target_vue.read_text() == STUB_VUE
         assert target_ts.read_text() == STUB_TYPES
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_stubs_restored_even_on_exception(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
+    def test_second_run_starts_from_stubs(self, mocks, fixture_path):
+        """Stubs restored at the end of run 1 are what the agent sees in run 2."""
+        target_vue = fixture_path / "target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
+        seen = []
+
+        def side_effect(*args, **kwargs):
+            seen.append(target_vue.read_text())
+            target_vue.write_text(COMPLETE_VUE)
+            return _DEFAULT_AGENT_RESULT
+
+        mocks.run_agent.side_effect = side_effect
+
+        test = AgentTest(model="m", fixture_path=fixture_path)
+        test.run(run_number=1)
+        test.run(run_number=2)
+        assert seen == [STUB_VUE, STUB_VUE]
+
+    def test_stubs_restored_even_on_exception(self, mocks, fixture_path):
         target_vue = fixture_path / "target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
         target_ts = fixture_path / "target_project" / "apps" / "web" / "src" / "registration" / "types" / "index.ts"
 
-        mock_run_agent.side_effect = RuntimeError("crash")
+        mocks.run_agent.side_effect = RuntimeError("crash")
 
         test = AgentTest(model="m", fixture_path=fixture_path)
         with pytest.raises(RuntimeError):
@@ -313,95 +342,109 @@ class TestAgentTestRun:
         assert target_vue.read_text() == STUB_VUE
         assert target_ts.read_text() == STUB_TYPES
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_ast_exception_produces_degraded_result(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.side_effect = Exception("regex crashed")
-        mock_validator.validate_naming.return_value = _make_naming_result()
+    @pytest.mark.parametrize("failing,score_attr", [
+        ("validate_ast_structure", "pattern_score"),
+        ("validate_naming", "naming_score"),
+    ])
+    def test_validator_exception_produces_degraded_result(self, mocks, fixture_path, failing, score_attr):
+        getattr(mocks.validator, failing).side_effect = Exception("regex crashed")
 
         result = AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
-        assert result.pattern_score == 0.0
+        assert getattr(result, score_attr) == 0.0
         assert len(result.errors) > 0
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_validate_ast_receives_combined_code(self, mock_run_agent, mock_validator, tmp_path):
+    def test_validate_ast_receives_combined_code(self, mocks, fixture_path):
         """validate_ast_structure must receive content from both files combined."""
-        fixture_path = _make_fixture(tmp_path)
         target_vue = fixture_path / "target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
         target_ts = fixture_path / "target_project" / "apps" / "web" / "src" / "registration" / "types" / "index.ts"
 
         def side_effect(*args, **kwargs):
             target_vue.write_text(COMPLETE_VUE)
             target_ts.write_text("export const schema = z.object({});")
-            return _make_agent_result()
+            return _DEFAULT_AGENT_RESULT
 
-        mock_run_agent.side_effect = side_effect
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.return_value = _make_ast_result()
-        mock_validator.validate_naming.return_value = _make_naming_result()
+        mocks.run_agent.side_effect = side_effect
 
         AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
 
-        call_args = mock_validator.validate_ast_structure.call_args
+        call_args = mocks.validator.validate_ast_structure.call_args
         code_arg = call_args[0][0] if call_args[0] else call_args.kwargs.get("code", "")
         # Both file contents must be present
         assert "z.object" in code_arg or COMPLETE_VUE[:50] in code_arg
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_run_number_in_result(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.return_value = _make_ast_result()
-        mock_validator.validate_naming.return_value = _make_naming_result()
-
+    def test_run_number_in_result(self, mocks, fixture_path):
         result = AgentTest(model="m", fixture_path=fixture_path).run(run_number=3)
         assert result.run_number == 3
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_query_rag_tool_included_in_agent_tools(self, mock_run_agent, mock_validator, tmp_path):
+    def test_query_rag_tool_included_in_agent_tools(self, mocks, fixture_path):
         """run_agent must receive a tool named 'query_rag'."""
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.return_value = _make_ast_result()
-        mock_validator.validate_naming.return_value = _make_naming_result()
 
         AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
 
-        call_kwargs = mock_run_agent.call_args
+        call_kwargs = mocks.run_agent.call_args
         tools = call_kwargs.kwargs.get("tools") or (call_kwargs[0][2] if len(call_kwargs[0]) > 2 else [])
         tool_names = [getattr(t, "name", None) for t in tools]
         assert "query_rag" in tool_names
 
 
+# ---------------------------------------------------------------------------
+# AgentTest.run() — compile timeout budget
+# ---------------------------------------------------------------------------
+
+_TIMED_OUT_COMPILATION = CompilationResult(
+    success=False, errors=["Compilation timeout after 60 seconds"], warnings=[], duration_sec=60.0, timed_out=True,
+)
+
+
+class TestCompileTimeoutBudget:
+
+    def test_compile_durations_drive_the_timeout(self, mocks, fixture_path):
+        mocks.validator.validate_compilation.return_value = replace(_DEFAULT_COMPILATION_RESULT, duration_sec=4.0)
+        test = AgentTest(model="m", fixture_path=fixture_path)
+        for run_number in range(1, MIN_SAMPLES + 1):
+            test.run(run_number=run_number)
+        assert mocks.validator.validate_compilation.call_args.kwargs["timeout"] == DEFAULT_COMPILE_TIMEOUT
+
+        test.run(run_number=MIN_SAMPLES + 1)
+        assert mocks.validator.validate_compilation.call_args.kwargs["timeout"] == pytest.approx(12.0)
+        assert mocks.run_agent.call_count == MIN_SAMPLES + 1
+
+    def test_consecutive_timeouts_abort_before_next_run(self, mocks, fixture_path):
+        target_vue = fixture_path / "target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
+
+        def side_effect(*args, **kwargs):
+            target_vue.write_text(COMPLETE_VUE)
+            return _DEFAULT_AGENT_RESULT
+
+        mocks.run_agent.side_effect = side_effect
+        mocks.validator.validate_compilation.return_value = _TIMED_OUT_COMPILATION
+
+        test = AgentTest(model="m", fixture_path=fixture_path)
+        # The run that hits the threshold still returns its result
+        results = [test.run(run_number=n) for n in range(1, MAX_CONSECUTIVE_TIMEOUTS + 1)]
+        assert [r.run_number for r in results] == list(range(1, MAX_CONSECUTIVE_TIMEOUTS + 1))
+        assert target_vue.read_text() == STUB_VUE
+
+        with pytest.raises(BenchmarkAborted):
+            test.run(run_number=MAX_CONSECUTIVE_TIMEOUTS + 1)
+        assert mocks.run_agent.call_count == MAX_CONSECUTIVE_TIMEOUTS
+
+
 # ---------------------------------------------------------------------------
 # AgentTest.run() — aborted run handling
 # ---------------------------------------------------------------------------
 
 class TestAbortedRun:
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_aborted_true_when_run_crashed(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result(run_crashed=True, steps=0, errors=["Ollama error"])
+    def test_aborted_true_when_run_crashed(self, mocks, fixture_path):
+        mocks.run_agent.return_value = _make_agent_result(run_crashed=True, steps=0, errors=["Ollama error"])
 
         result = AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
 
         assert result.aborted is True
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_aborted_run_scores_are_zero(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result(run_crashed=True, steps=0)
+    def test_aborted_run_scores_are_zero(self, mocks, fixture_path):
+        mocks.run_agent.return_value = _make_agent_result(run_crashed=True, steps=0)
 
         result = AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
 
@@ -410,26 +453,17 @@ class TestAbortedRun:
         assert result.naming_score == 0.0
         assert result.compiles is False
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_aborted_run_skips_validation(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result(run_crashed=True, steps=0)
+    def test_aborted_run_skips_validation(self, mocks, fixture_path):
+        mocks.run_agent.return_value = _make_agent_result(run_crashed=True, steps=0)
 
         AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
 
-        mock_validator.validate_compilation.assert_not_called()
-        mock_validator.validate_ast_structure.assert_not_called()
-        mock_validator.validate_naming.assert_not_called()
+        mocks.validator.validate_compilation.assert_not_called()
+        mocks.validator.validate_ast_structure.assert_not_called()
+        mocks.validator.validate_naming.assert_not_called()
 
-    @patch("src.agent.nuxt_form_agent_full.test_runner.validator")
-    @patch("src.agent.nuxt_form_agent_full.test_runner.run_agent")
-    def test_non_crashed_run_not_aborted(self, mock_run_agent, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_run_agent.return_value = _make_agent_result(run_crashed=False)
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.return_value = _make_ast_result()
-        mock_validator.validate_naming.return_value = _make_naming_result()
+    def test_non_crashed_run_not_aborted(self, mocks, fixture_path):
+        mocks.run_agent.return_value = _make_agent_result(run_crashed=False)
 
         result = AgentTest(model="m", fixture_path=fixture_path).run(run_number=1)
 
@@ -444,9 +478,6 @@ class TestWriteFileDecoupled:
 
     def test_write_file_returns_file_written_only(self, tmp_path):
         """After decoupling, write_file must return 'File written.' with no compilation output."""
-        from src.agent.nuxt_form_agent_full.test_runner import _make_tools
-        from unittest.mock import MagicMock
-
         allowed_path = "apps/web/src/registration/components/RegistrationForm.vue"
         comp_dir = tmp_path / "apps" / "web" / "src" / "registration" / "components"
         comp_dir.mkdir(parents=True)
@@ -28,6 +28,7 @@ from src.agent.nuxt_form_agent_full.validator import (
     validate_compilation,
     validate_naming,
 )
+from src.common.compilation import DEFAULT_COMPILE_TIMEOUT
 
 # ---------------------------------------------------------------------------
 # Complete component fixture (all patterns present)
@@ -238,6 +239,7 @@ class TestValidateCompilation:
                 compilation_cwd=tmp_path,
             )
         assert result.success is False
+        assert result.timed_out is True
         assert any("timeout" in e.lower() for e in result.errors)
 
     def test_returns_compilation_result_instance(self, tmp_path):
@@ -258,6 +260,34 @@ class TestValidateCompilation:
                 compilation_cwd=tmp_path / "nonexistent",
             )
 
+    def test_passes_timeout_and_argv_to_subprocess(self, tmp_path):
+        with patch("subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+            result = validate_compilation(
+                target_project=tmp_path,
+                compilation_command="check-types",
+                compilation_cwd=tmp_path,
+                timeout=12.5,
+                compile_argv=["vue-tsc", "--noEmit"],
+            )
+        assert mock_run.call_args.args[0] == ["vue-tsc", "--noEmit"]
+        assert mock_run.call_args.kwargs["timeout"] == 12.5
+        assert result.timed_out is False
+
+    def test_short_timeout_retried_with_default(self, tmp_path):
+        ok = MagicMock(returncode=0, stdout="", stderr="")
+        with patch("subprocess.run", side_effect=[subprocess.TimeoutExpired(cmd="vue-tsc", timeout=5), ok]) as mock_run:
+            result = validate_compilation(
+                target_project=tmp_path,
+                compilation_command="check-types",
+                compilation_cwd=tmp_path,
+                timeout=5,
+                compile_argv=["vue-tsc", "--noEmit"],
+            )
+        assert [c.kwargs["timeout"] for c in mock_run.call_args_list] == [5, DEFAULT_COMPILE_TIMEOUT]
+        assert result.success is True
+        assert result.timed_out is False
+
 
 # ---------------------------------------------------------------------------
 # validate_naming
@@ -7,13 +7,23 @@ Key differences from standard CreationTest:
 """
 
 import json
+import shutil
+from dataclasses import asdict, replace
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
+from src.common.compilation import (
+    DEFAULT_COMPILE_TIMEOUT,
+    MAX_CONSECUTIVE_TIMEOUTS,
+    MIN_SAMPLES,
+    BenchmarkAborted,
+)
+from src.common.ollama_client import ChatResult
 from src.creation.nuxt_form_oneshot.test_runner import BenchmarkResult, CreationTest
+from src.creation.nuxt_form_oneshot.validator import ASTResult, CompilationResult, NamingResult
 
 STUB_VUE = "<script setup lang='ts'>\n// TODO\n</script>\n\n<template>\n  <div></div>\n</template>\n"
 STUB_TYPES = "// types stub\n"
@@ -58,6 +68,13 @@ DEFAULT_SPEC = {
     "naming_conventions": {"variables": "camelCase"},
     "scoring": {"compilation": 0.5, "pattern_match": 0.4, "naming": 0.1},
 }
+_DEFAULT_SPEC_JSON = json.dumps(DEFAULT_SPEC)
+
+# Pre-encoded fixture file contents (written with write_bytes)
+_PROMPT_BYTES = b"Implement a registration form."
+_DEFAULT_SPEC_BYTES = _DEFAULT_SPEC_JSON.encode("utf-8")
+_STUB_VUE_BYTES = STUB_VUE.encode("utf-8")
+_STUB_TYPES_BYTES = STUB_TYPES.encode("utf-8")
 
 
 def _make_fixture(tmp_path: Path, spec=None) -> Path:
@@ -66,70 +83,103 @@ def _make_fixture(tmp_path: Path, spec=None) -> Path:
     shared_tp = tmp_path / "shared_target_project"
     comp_dir = shared_tp / "apps" / "web" / "src" / "registration" / "components"
     comp_dir.mkdir(parents=True)
-    (comp_dir / "RegistrationForm.vue").write_text(STUB_VUE)
+    (comp_dir / "RegistrationForm.vue").write_bytes(_STUB_VUE_BYTES)
 
     types_dir = shared_tp / "apps" / "web" / "src" / "registration" / "types"
     types_dir.mkdir(parents=True)
-    (types_dir / "index.ts").write_text(STUB_TYPES)
+    (types_dir / "index.ts").write_bytes(_STUB_TYPES_BYTES)
 
     # Fixture dir
     fixture_path = tmp_path / "nuxt-form-creation"
     fixture_path.mkdir()
-    (fixture_path / "prompt.md").write_text("Implement a registration form.")
-    target_spec = spec if spec is not None else DEFAULT_SPEC
-    (fixture_path / "validation_spec.json").write_text(json.dumps(target_spec))
+    (fixture_path / "prompt.md").write_bytes(_PROMPT_BYTES)
+    payload = _DEFAULT_SPEC_BYTES if spec is None else json.dumps(spec).encode("utf-8")
+    (fixture_path / "validation_spec.json").write_bytes(payload)
 
     return fixture_path
 
 
+@pytest.fixture(scope="session")
+def _fixture_template(tmp_path_factory) -> Path:
+    """Default fixture + shared target project, built once per session."""
+    return _make_fixture(tmp_path_factory.mktemp("template"))
+
+
+@pytest.fixture
+def fixture_path(_fixture_template, tmp_path) -> Path:
+    """Per-test copy of the default fixture; shared_target_project lands next to it in tmp_path."""
+    shutil.copytree(_fixture_template.parent, tmp_path, dirs_exist_ok=True)
+    return tmp_path / _fixture_template.name
+
+
+# Test doubles use the real result types so a field rename in src/ breaks these
+# helpers instead of passing silently.
 def _make_chat_result(response="```vue\n" + COMPLETE_VUE + "\n```"):
-    return SimpleNamespace(
+    return ChatResult(
         response_text=response,
-        tokens_per_sec=30.0,
         duration_sec=5.0,
+        tokens_generated=150,
+        tokens_per_sec=30.0,
+        success=True,
+        error=None,
     )
 
 
 def _make_compilation_result(success=True, errors=None, warnings=None):
-    return SimpleNamespace(success=success, errors=errors or [], warnings=warnings or [], duration_sec=1.0)
+    return CompilationResult(success=success, errors=errors or [], warnings=warnings or [], duration_sec=1.0)
 
 
 def _make_ast_result(score=10.0, missing=None, checks=None):
-    return SimpleNamespace(score=score, missing=missing or [], checks=checks or {"script_lang": True})
+    return ASTResult(score=score, missing=missing or [], checks=checks or {"script_lang": True})
 
 
 def _make_naming_result(score=1.0, violations=None):
-    return SimpleNamespace(score=score, violations=violations or [], follows_conventions=score == 1.0)
+    return NamingResult(follows_conventions=score == 1.0, violations=violations or [], score=score)
+
+
+# Default results, shared between tests: the runner only reads them.
+_DEFAULT_CHAT_RESULT = _make_chat_result()
+_DEFAULT_COMPILATION_RESULT = _make_compilation_result()
+_DEFAULT_AST_RESULT = _make_ast_result()
+_DEFAULT_NAMING_RESULT = _make_naming_result()
+
+
+@pytest.fixture
+def mocks(monkeypatch):
+    """Patch ollama_client and validator in the runner; both default to a successful run."""
+    ollama_client, validator = MagicMock(), MagicMock()
+    ollama_client.chat.return_value = _DEFAULT_CHAT_RESULT
+    validator.validate_compilation.return_value = _DEFAULT_COMPILATION_RESULT
+    validator.validate_ast_structure.return_value = _DEFAULT_AST_RESULT
+    validator.validate_naming.return_value = _DEFAULT_NAMING_RESULT
+    monkeypatch.setattr("src.creation.nuxt_form_oneshot.test_runner.ollama_client", ollama_client)
+    monkeypatch.setattr("src.creation.nuxt_form_oneshot.test_runner.validator", validator)
+    return SimpleNamespace(ollama_client=ollama_client, validator=validator)
 
 
 # ---------------------------------------------------------------------------
 # BenchmarkResult
 # ---------------------------------------------------------------------------
 
+_BASE_RESULT_KWARGS = dict(
+    model="m", fixture="f", timestamp="t", run_number=1,
+    compiles=True, compilation_errors=[], compilation_warnings=[],
+    pattern_score=10.0, ast_missing=[], ast_checks={},
+    naming_score=10.0, naming_violations=[], final_score=10.0,
+    scoring_weights={}, tokens_per_sec=0.0, duration_sec=1.0,
+    output_code="", errors=[],
+)
+
+
 class TestBenchmarkResult:
 
     def test_all_fields_present(self):
-        r = BenchmarkResult(
-            model="m", fixture="f", timestamp="t", run_number=1,
-            compiles=True, compilation_errors=[], compilation_warnings=[],
-            pattern_score=10.0, ast_missing=[], ast_checks={},
-            naming_score=10.0, naming_violations=[], final_score=10.0,
-            scoring_weights={}, tokens_per_sec=0.0, duration_sec=1.0,
-            output_code="", errors=[],
-        )
+        r = BenchmarkResult(**_BASE_RESULT_KWARGS)
         assert r.final_score == 10.0
 
     def test_json_serialisable(self):
-        r = BenchmarkResult(
-            model="m", fixture="f", timestamp="t", run_number=1,
-            compiles=True, compilation_errors=[], compilation_warnings=[],
-            pattern_score=10.0, ast_missing=[], ast_checks={},
-            naming_score=10.0, naming_violations=[], final_score=10.0,
-            scoring_weights={}, tokens_per_sec=0.0, duration_sec=1.0,
-            output_code="", errors=[],
-        )
-        import json as _json
-        assert "final_score" in _json.dumps(r.__dict__)
+        r = BenchmarkResult(**_BASE_RESULT_KWARGS)
+        assert "final_score" in json.dumps(asdict(r))
 
 
 # ---------------------------------------------------------------------------
@@ -138,57 +188,39 @@ class TestBenchmarkResult:
 
 class TestCreationTestInit:
 
-    def test_loads_prompt_and_spec(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        test = CreationTest(model="test-model", fixture_path=fixture_path)
+    # CreationTest.__init__ only reads the fixture, so these use the session template directly.
+
+    def test_loads_prompt_and_spec(self, _fixture_template):
+        test = CreationTest(model="test-model", fixture_path=_fixture_template)
         assert "registration form" in test.prompt_template.lower()
         assert test.validation_spec["target_file"].endswith("RegistrationForm.vue")
 
-    def test_resolves_target_project_from_spec(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        test = CreationTest(model="test-model", fixture_path=fixture_path)
-        assert test.target_project == (tmp_path / "shared_target_project").resolve()
+    def test_resolves_target_project_from_spec(self, _fixture_template):
+        test = CreationTest(model="test-model", fixture_path=_fixture_template)
+        assert test.target_project == (_fixture_template.parent / "shared_target_project").resolve()
 
-    def test_reads_compilation_config(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        test = CreationTest(model="test-model", fixture_path=fixture_path)
+    def test_reads_compilation_config(self, _fixture_template):
+        test = CreationTest(model="test-model", fixture_path=_fixture_template)
         assert test._compilation_command == "check-types"
         assert test._compilation_cwd.name == "web"
 
-    def test_stores_original_stub(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        test = CreationTest(model="test-model", fixture_path=fixture_path)
+    def test_stores_original_stub(self, _fixture_template):
+        test = CreationTest(model="test-model", fixture_path=_fixture_template)
         assert test.original_code == STUB_VUE
 
-    def test_raises_on_missing_prompt(self, tmp_path):
-        fixture_path = tmp_path / "broken"
-        fixture_path.mkdir()
-        with pytest.raises(FileNotFoundError, match="prompt.md"):
-            CreationTest(model="m", fixture_path=fixture_path)
-
-    def test_raises_on_missing_spec(self, tmp_path):
-        fixture_path = tmp_path / "broken"
-        fixture_path.mkdir()
-        (fixture_path / "prompt.md").write_text("task")
-        with pytest.raises(FileNotFoundError, match="validation_spec.json"):
-            CreationTest(model="m", fixture_path=fixture_path)
-
-    def test_raises_when_target_project_not_found(self, tmp_path):
-        fixture_path = tmp_path / "nuxt-form-creation"
-        fixture_path.mkdir()
-        (fixture_path / "prompt.md").write_text("task")
-        spec = dict(DEFAULT_SPEC)
-        spec["target_project_path"] = "../nonexistent"
-        (fixture_path / "validation_spec.json").write_text(json.dumps(spec))
-        with pytest.raises(FileNotFoundError):
-            CreationTest(model="m", fixture_path=fixture_path)
-
-    def test_raises_when_target_file_not_found(self, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        # Remove the stub file
-        target = tmp_path / "shared_target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
-        target.unlink()
-        with pytest.raises(FileNotFoundError):
+    @pytest.mark.parametrize("missing,match", [
+        ("nuxt-form-creation/prompt.md", "prompt.md"),
+        ("nuxt-form-creation/validation_spec.json", "validation_spec.json"),
+        ("shared_target_project", "target_project not found"),
+        ("shared_target_project/apps/web/src/registration/components/RegistrationForm.vue", "RegistrationForm.vue"),
+    ])
+    def test_raises_on_missing_fixture_file(self, fixture_path, tmp_path, missing, match):
+        path = tmp_path / missing
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+        with pytest.raises(FileNotFoundError, match=match):
             CreationTest(model="m", fixture_path=fixture_path)
 
     def test_falls_back_to_local_target_project_when_no_override(self, tmp_path):
@@ -216,79 +248,61 @@ class TestCreationTestInit:
 
 class TestCreationTestRun:
 
-    @patch("src.creation.nuxt_form_oneshot.test_runner.validator")
-    @patch("src.creation.nuxt_form_oneshot.test_runner.ollama_client")
-    def test_returns_benchmark_result(self, mock_ollama, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_ollama.chat.return_value = _make_chat_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.return_value = _make_ast_result()
-        mock_validator.validate_naming.return_value = _make_naming_result()
-
+    def test_returns_benchmark_result(self, mocks, fixture_path):
         result = CreationTest(model="m", fixture_path=fixture_path).run(run_number=1)
         assert isinstance(result, BenchmarkResult)
 
-    @patch("src.creation.nuxt_form_oneshot.test_runner.validator")
-    @patch("src.creation.nuxt_form_oneshot.test_runner.ollama_client")
-    def test_perfect_score_when_all_pass(self, mock_ollama, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_ollama.chat.return_value = _make_chat_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result(success=True)
-        mock_validator.validate_ast_structure.return_value = _make_ast_result(score=10.0)
-        mock_validator.validate_naming.return_value = _make_naming_result(score=1.0)
+    def test_perfect_score_when_all_pass(self, mocks, fixture_path):
+        mocks.validator.validate_compilation.return_value = _make_compilation_result(success=True)
+        mocks.validator.validate_ast_structure.return_value = _make_ast_result(score=10.0)
+        mocks.validator.validate_naming.return_value = _make_naming_result(score=1.0)
 
         result = CreationTest(model="m", fixture_path=fixture_path).run()
         assert result.final_score == pytest.approx(10.0)
 
-    @patch("src.creation.nuxt_form_oneshot.test_runner.validator")
-    @patch("src.creation.nuxt_form_oneshot.test_runner.ollama_client")
-    def test_zero_score_when_all_fail(self, mock_ollama, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_ollama.chat.return_value = _make_chat_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result(success=False)
-        mock_validator.validate_ast_structure.return_value = _make_ast_result(score=0.0)
-        mock_validator.validate_naming.return_value = _make_naming_result(score=0.0)
+    def test_zero_score_when_all_fail(self, mocks, fixture_path):
+        mocks.validator.validate_compilation.return_value = _make_compilation_result(success=False)
+        mocks.validator.validate_ast_structure.return_value = _make_ast_result(score=0.0)
+        mocks.validator.validate_naming.return_value = _make_naming_result(score=0.0)
 
         result = CreationTest(model="m", fixture_path=fixture_path).run()
         assert result.final_score == pytest.approx(0.0)
 
-    @patch("src.creation.nuxt_form_oneshot.test_runner.validator")
-    @patch("src.creation.nuxt_form_oneshot.test_runner.ollama_client")
-    def test_weighted_scoring(self, mock_ollama, mock_validator, tmp_path):
+    def test_weighted_scoring(self, mocks, fixture_path):
         """compile(1.0)*0.5 + pattern(0.5)*0.4 + naming(0.0)*0.1 = 0.7 → 7.0"""
-        fixture_path = _make_fixture(tmp_path)
-        mock_ollama.chat.return_value = _make_chat_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result(success=True)
-        mock_validator.validate_ast_structure.return_value = _make_ast_result(score=5.0)
-        mock_validator.validate_naming.return_value = _make_naming_result(score=0.0)
+        mocks.validator.validate_compilation.return_value = _make_compilation_result(success=True)
+        mocks.validator.validate_ast_structure.return_value = _make_ast_result(score=5.0)
+        mocks.validator.validate_naming.return_value = _make_naming_result(score=0.0)
 
         result = CreationTest(model="m", fixture_path=fixture_path).run()
         assert result.final_score == pytest.approx(7.0)
 
-    @patch("src.creation.nuxt_form_oneshot.test_runner.validator")
-    @patch("src.creation.nuxt_form_oneshot.test_runner.ollama_client")
-    def test_stub_restored_after_run(self, mock_ollama, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
+    def test_stub_restored_after_run(self, mocks, fixture_path, tmp_path):
         target_vue = tmp_path / "shared_target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
 
         def side_effect(*args, **kwargs):
             target_vue.write_text(COMPLETE_VUE)
             return _make_chat_result(response=COMPLETE_VUE)
 
-        mock_ollama.chat.side_effect = side_effect
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.return_value = _make_ast_result()
-        mock_validator.validate_naming.return_value = _make_naming_result()
+        mocks.ollama_client.chat.side_effect = side_effect
 
         CreationTest(model="m", fixture_path=fixture_path).run()
         assert target_vue.read_text() == STUB_VUE
 
-    @patch("src.creation.nuxt_form_oneshot.test_runner.validator")
-    @patch("src.creation.nuxt_form_oneshot.test_runner.ollama_client")
-    def test_stub_restored_on_exception(self, mock_ollama, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
+    def test_stub_not_rewritten_when_unchanged(self, mocks, fixture_path, monkeypatch):
+        """A run that never wrote output leaves the target file untouched."""
+        mocks.ollama_client.chat.side_effect = RuntimeError("crash")
+        mock_write = MagicMock()
+        monkeypatch.setattr("src.creation.nuxt_form_oneshot.test_runner.atomic_write", mock_write)
+
+        test = CreationTest(model="m", fixture_path=fixture_path)
+        with pytest.raises(RuntimeError):
+            test.run()
+        mock_write.assert_not_called()
+
+    def test_stub_restored_on_exception(self, mocks, fixture_path, tmp_path):
         target_vue = tmp_path / "shared_target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
-        mock_ollama.chat.side_effect = RuntimeError("crash")
+        mocks.ollama_client.chat.side_effect = RuntimeError("crash")
 
         test = CreationTest(model="m", fixture_path=fixture_path)
         with pytest.raises(RuntimeError):
@@ -296,26 +310,56 @@ class TestCreationTestRun:
 
         assert target_vue.read_text() == STUB_VUE
 
-    @patch("src.creation.nuxt_form_oneshot.test_runner.validator")
-    @patch("src.creation.nuxt_form_oneshot.test_runner.ollama_client")
-    def test_run_number_in_result(self, mock_ollama, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_ollama.chat.return_value = _make_chat_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.return_value = _make_ast_result()
-        mock_validator.validate_naming.return_value = _make_naming_result()
+    def test_compile_command_resolved_once(self, mocks, fixture_path, monkeypatch):
+        resolve = MagicMock(return_value=["vue-tsc", "--noEmit"])
+        monkeypatch.setattr("src.creation.nuxt_form_oneshot.test_runner.resolve_compile_command", resolve)
+
+        test = CreationTest(model="m", fixture_path=fixture_path)
+        test.run(run_number=1)
+        test.run(run_number=2)
+
+        resolve.assert_called_once()
+        assert mocks.validator.validate_compilation.call_args.kwargs["compile_argv"] == ["vue-tsc", "--noEmit"]
+
+    def test_close_shuts_down_compile_pool(self, mocks, fixture_path):
+        test = CreationTest(model="m", fixture_path=fixture_path)
+        test.run()
+        test.close()
+        with pytest.raises(RuntimeError):
+            test._compile_pool.submit(print)
+
+    def test_compile_durations_drive_the_timeout(self, mocks, fixture_path):
+        mocks.validator.validate_compilation.return_value = replace(_DEFAULT_COMPILATION_RESULT, duration_sec=4.0)
+        test = CreationTest(model="m", fixture_path=fixture_path)
+        for run_number in range(1, MIN_SAMPLES + 1):
+            test.run(run_number=run_number)
+        assert mocks.validator.validate_compilation.call_args.kwargs["timeout"] == DEFAULT_COMPILE_TIMEOUT
+
+        test.run(run_number=MIN_SAMPLES + 1)
+        assert mocks.validator.validate_compilation.call_args.kwargs["timeout"] == pytest.approx(12.0)
+
+    def test_consecutive_timeouts_abort_before_next_run(self, mocks, fixture_path, tmp_path):
+        target_vue = tmp_path / "shared_target_project" / "apps" / "web" / "src" / "registration" / "components" / "RegistrationForm.vue"
+        mocks.validator.validate_compilation.return_value = CompilationResult(
+            success=False, errors=["Compilation timeout after 60 seconds"], warnings=[], duration_sec=60.0, timed_out=True,
+        )
+
+        test = CreationTest(model="m", fixture_path=fixture_path)
+        # The run that hits the threshold still returns its result
+        results = [test.run(run_number=n) for n in range(1, MAX_CONSECUTIVE_TIMEOUTS + 1)]
+        assert [r.run_number for r in results] == list(range(1, MAX_CONSECUTIVE_TIMEOUTS + 1))
+        assert target_vue.read_text() == STUB_VUE
+
+        with pytest.raises(BenchmarkAborted):
+            test.run(run_number=MAX_CONSECUTIVE_TIMEOUTS + 1)
+        assert mocks.ollama_client.chat.call_count == MAX_CONSECUTIVE_TIMEOUTS
 
+    def test_run_number_in_result(self, mocks, fixture_path):
         result = CreationTest(model="m", fixture_path=fixture_path).run(run_number=3)
         assert result.run_number == 3
 
-    @patch("src.creation.nuxt_form_oneshot.test_runner.validator")
-    @patch("src.creation.nuxt_form_oneshot.test_runner.ollama_client")
-    def test_ast_exception_produces_degraded_result(self, mock_ollama, mock_validator, tmp_path):
-        fixture_path = _make_fixture(tmp_path)
-        mock_ollama.chat.return_value = _make_chat_result()
-        mock_validator.validate_compilation.return_value = _make_compilation_result()
-        mock_validator.validate_ast_structure.side_effect = Exception("crash")
-        mock_validator.validate_naming.return_value = _make_naming_result()
+    def test_ast_exception_produces_degraded_result(self, mocks, fixture_path):
+        mocks.validator.validate_ast_structure.side_effect = Exception("crash")
 
         result = CreationTest(model="m", fixture_path=fixture_path).run()
         assert result.pattern_score == 0.0
@@ -16,6 +16,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from src.common.compilation import DEFAULT_COMPILE_TIMEOUT
 from src.creation.nuxt_form_oneshot.validator import (
     ASTResult,
     CompilationResult,
@@ -181,6 +182,7 @@ class TestValidateCompilation:
         with patch("subprocess.run", side_effect=subprocess.TimeoutExpired(cmd="npm", timeout=60)):
             result = validate_compilation(tmp_path, "check-types", tmp_path)
         assert result.success is False
+        assert result.timed_out is True
 
     def test_returns_compilation_result(self, tmp_path):
         with patch("subprocess.run") as m:
@@ -191,6 +193,22 @@ class TestValidateCompilation:
         with pytest.raises(FileNotFoundError):
             validate_compilation(tmp_path / "nonexistent", "check-types", tmp_path / "nonexistent")
 
+    def test_passes_timeout_and_argv_to_subprocess(self, tmp_path):
+        with patch("subprocess.run") as m:
+            m.return_value = MagicMock(returncode=0, stdout="", stderr="")
+            result = validate_compilation(tmp_path, "check-types", tmp_path, timeout=12.5, compile_argv=["vue-tsc", "--noEmit"])
+        assert m.call_args.args[0] == ["vue-tsc", "--noEmit"]
+        assert m.call_args.kwargs["timeout"] == 12.5
+        assert result.timed_out is False
+
+    def test_short_timeout_retried_with_default(self, tmp_path):
+        ok = MagicMock(returncode=0, stdout="", stderr="")
+        with patch("subprocess.run", side_effect=[subprocess.TimeoutExpired(cmd="vue-tsc", timeout=5), ok]) as m:
+            result = validate_compilation(tmp_path, "check-types", tmp_path, timeout=5, compile_argv=["vue-tsc", "--noEmit"])
+        assert [c.kwargs["timeout"] for c in m.call_args_list] == [5, DEFAULT_COMPILE_TIMEOUT]
+        assert result.success is True
+        assert result.timed_out is False
+
 
 class TestValidateNaming:
 
@@ -1,8 +1,5 @@
 """Tests for ollama_client module."""
 
-import os
-from unittest.mock import Mock, patch
-
 import pytest
 
 from src.common.ollama_client import (
@@ -14,56 +11,67 @@ from src.common.ollama_client import (
 )
 
 
+def _fake_chat(monkeypatch, response=None, error=None):
+    """Replace ollama.chat with a stub; returns the dict its kwargs are captured into."""
+    captured = {}
+
+    def fake_chat(**kwargs):
+        captured.update(kwargs)
+        if error is not None:
+            raise error
+        return response
+
+    monkeypatch.setattr("src.common.ollama_client.ollama.chat", fake_chat)
+    return captured
+
+
 class TestOllamaConfiguration:
     """Test Ollama base URL configuration from environment."""
 
-    def test_default_ollama_url(self):
+    def test_default_ollama_url(self, monkeypatch):
         """Should return localhost:11434 when no env var is set."""
-        with patch.dict(os.environ, {}, clear=True):
-            assert get_ollama_base_url() == "http://localhost:11434"
+        monkeypatch.delenv("OLLAMA_BASE_URL", raising=False)
+        assert get_ollama_base_url() == "http://localhost:11434"
 
-    def test_custom_ollama_url_from_env(self):
+    def test_custom_ollama_url_from_env(self, monkeypatch):
         """Should return custom URL when OLLAMA_BASE_URL is set."""
-        with patch.dict(os.environ, {"OLLAMA_BASE_URL": "http://192.168.1.100:11434"}):
-            assert get_ollama_base_url() == "http://192.168.1.100:11434"
+        monkeypatch.setenv("OLLAMA_BASE_URL", "http://192.168.1.100:11434")
+        assert get_ollama_base_url() == "http://192.168.1.100:11434"
 
 
 class TestChatFunction:
     """Test chat() — metadata extraction and tokens/sec calculation."""
 
-    @patch("src.common.ollama_client.ollama.chat")
-    def test_parses_nanoseconds_to_seconds(self, mock_chat):
+    def test_parses_nanoseconds_to_seconds(self, monkeypatch):
         """Should convert eval_duration from nanoseconds to seconds."""
-        mock_chat.return_value = {
+        _fake_chat(monkeypatch, {
             "message": {"content": "hello"},
             "eval_duration": 2_500_000_000,  # 2.5 billion ns = 2.5s
             "eval_count": 10,
-        }
+        })
 
         result = chat(model="test", prompt="test")
 
-        assert result.duration_sec == 2.5
+        assert result.duration_sec == pytest.approx(2.5)
 
-    @patch("src.common.ollama_client.ollama.chat")
-    def test_calculates_tokens_per_sec(self, mock_chat):
+    def test_calculates_tokens_per_sec(self, monkeypatch):
         """Should derive tokens/sec from eval_count / duration."""
-        mock_chat.return_value = {
+        _fake_chat(monkeypatch, {
             "message": {"content": "hello"},
             "eval_duration": 2_500_000_000,  # 2.5s
             "eval_count": 10,
-        }
+        })
 
         result = chat(model="test", prompt="test")
 
-        assert result.tokens_per_sec == 4.0  # 10 / 2.5
+        assert result.tokens_per_sec == pytest.approx(4.0)  # 10 / 2.5
 
-    @patch("src.common.ollama_client.ollama.chat")
-    def test_handles_missing_metadata_with_defaults(self, mock_chat):
+    def test_handles_missing_metadata_with_defaults(self, monkeypatch):
         """Should return 0 for metrics when response lacks timing metadata."""
-        mock_chat.return_value = {
+        _fake_chat(monkeypatch, {
             "message": {"content": "response"},
             # no eval_duration, no eval_count
-        }
+        })
 
         result = chat(model="test", prompt="test")
 
@@ -72,50 +80,34 @@ class TestChatFunction:
         assert result.tokens_generated == 0
         assert result.tokens_per_sec == 0.0
 
-    @patch("src.common.ollama_client.ollama.chat")
-    def test_passes_model_and_prompt_to_api(self, mock_chat):
+    def test_passes_model_and_prompt_to_api(self, monkeypatch):
         """Should forward model name and prompt to the Ollama SDK."""
-        mock_chat.return_value = {
+        captured = _fake_chat(monkeypatch, {
             "message": {"content": "ok"},
             "eval_duration": 1_000_000_000,
             "eval_count": 5,
-        }
+        })
 
         chat(model="qwen2.5-coder:7b", prompt="Say hello")
 
-        call_kwargs = mock_chat.call_args[1]
-        assert call_kwargs["model"] == "qwen2.5-coder:7b"
-        assert call_kwargs["messages"][0]["content"] == "Say hello"
+        assert captured["model"] == "qwen2.5-coder:7b"
+        assert captured["messages"][0]["content"] == "Say hello"
 
 
 class TestChatErrorHandling:
     """Test that Ollama error messages are mapped to correct exception types."""
 
-    @patch("src.common.ollama_client.ollama.chat")
-    def test_model_not_found_raises_correct_exception(self, mock_chat):
-        """Should raise ModelNotFoundError for 'not found' errors."""
-        mock_chat.side_effect = Exception("model 'nonexistent:latest' not found")
-
-        with pytest.raises(ModelNotFoundError) as exc_info:
-            chat(model="nonexistent:latest", prompt="test")
-
-        assert "nonexistent:latest" in str(exc_info.value)
-
-    @patch("src.common.ollama_client.ollama.chat")
-    def test_connection_refused_raises_correct_exception(self, mock_chat):
-        """Should raise OllamaConnectionError for connection errors."""
-        mock_chat.side_effect = Exception("connection refused")
-
-        with pytest.raises(OllamaConnectionError):
-            chat(model="test", prompt="test")
-
-    @patch("src.common.ollama_client.ollama.chat")
-    def test_timeout_raises_correct_exception(self, mock_chat):
-        """Should raise TimeoutError for timeout errors."""
-        mock_chat.side_effect = Exception("timeout exceeded")
-
-        with pytest.raises(TimeoutError):
-            chat(model="test", prompt="test", timeout=5)
+    @pytest.mark.parametrize("error_msg,exc_type,match", [
+        ("model 'nonexistent:latest' not found", ModelNotFoundError, "nonexistent:latest"),
+        ("connection refused", OllamaConnectionError, "Connection error"),
+        ("timeout exceeded", TimeoutError, "timeout of 5s"),
+    ])
+    def test_error_mapped_to_exception(self, monkeypatch, error_msg, exc_type, match):
+        """Should map the SDK error message to the matching exception type."""
+        _fake_chat(monkeypatch, error=Exception(error_msg))
+
+        with pytest.raises(exc_type, match=match):
+            chat(model="nonexistent:latest", prompt="test", timeout=5)
 
 
 class TestChatIntegration:
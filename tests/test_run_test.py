@@ -7,6 +7,7 @@ These tests prevent regressions like the FIXTURES_BASE → TASKS_DIR bug where
 the default parameter of discover_fixtures referenced a deleted constant.
 """
 
+import contextlib
 import json
 import sys
 import types
@@ -25,8 +26,10 @@ from run_test import (
     _make_session_dir,
     discover_fixtures,
     parse_arguments,
+    run_fixture,
     save_results,
 )
+from src.common.compilation import MAX_CONSECUTIVE_TIMEOUTS, BenchmarkAborted, CompileTimeoutBudget
 from src.creation.nuxt_form_oneshot.test_runner import BenchmarkResult
 
 
@@ -485,3 +488,83 @@ class TestSaveResultsOutputDir:
         result = make_result()
         path = save_results([result], "model:7b", "fix", output_dir=custom_dir)
         assert ":" not in path.name
+
+
+# ---------------------------------------------------------------------------
+# run_fixture — early abort
+# ---------------------------------------------------------------------------
+
+class TestRunFixtureAbort:
+    def _runner_module(self, side_effect):
+        test = MagicMock()
+        test.run.side_effect = side_effect
+        module = types.SimpleNamespace(
+            CreationTest=MagicMock(return_value=test),
+            format_run=MagicMock(),
+        )
+        return module, test
+
+    def test_returns_completed_runs_on_abort(self, tmp_path):
+        first = make_result()
+        module, test = self._runner_module([first, BenchmarkAborted("timeouts"), make_result()])
+        results, _ = run_fixture("m", tmp_path, 3, module)
+        assert results == [first]
+        assert test.run.call_count == 2
+
+    def test_returns_none_if_first_run_aborts(self, tmp_path):
+        module, _ = self._runner_module(BenchmarkAborted("timeouts"))
+        assert run_fixture("m", tmp_path, 3, module) is None
+
+    @pytest.mark.parametrize("runs", [MAX_CONSECUTIVE_TIMEOUTS, MAX_CONSECUTIVE_TIMEOUTS + 2])
+    def test_keeps_run_that_exhausts_compile_budget(self, tmp_path, runs):
+        budget = CompileTimeoutBudget()
+
+        def timed_out_run(run_number, **kwargs):
+            budget.check()
+            budget.record(60.0, timed_out=True)
+            return make_result(run_number=run_number)
+
+        module, _ = self._runner_module(timed_out_run)
+        results, _ = run_fixture("m", tmp_path, runs, module)
+        assert [r.run_number for r in results] == list(range(1, MAX_CONSECUTIVE_TIMEOUTS + 1))
+
+    @pytest.mark.parametrize("side_effect", [
+        [make_result(), make_result()],
+        BenchmarkAborted("timeouts"),
+        RuntimeError("crash"),
+    ])
+    def test_closes_runner(self, tmp_path, side_effect):
+        module, test = self._runner_module(side_effect)
+        with contextlib.suppress(RuntimeError):
+            run_fixture("m", tmp_path, 2, module)
+        test.close.assert_called_once()
+
+
+# ---------------------------------------------------------------------------
+# main — aborted fixture
+# ---------------------------------------------------------------------------
+
+class TestMainAbortedFixture:
+    def _run_main(self, tmp_path, monkeypatch, results):
+        import run_test
+        fixture = tmp_path / "tasks" / "nuxt-form-oneshot"
+        fixture.mkdir(parents=True)
+        (fixture / "validation_spec.json").write_text("{}")
+        monkeypatch.setattr(run_test, "TASKS_DIR", fixture.parent)
+        monkeypatch.setattr(run_test, "OUTPUT_DIR", tmp_path / "results")
+        monkeypatch.setattr(run_test, "_get_runner_module", lambda _: types.SimpleNamespace())
+        monkeypatch.setattr(run_test, "run_fixture", MagicMock(return_value=(results, "prompt")))
+        save = MagicMock(return_value=tmp_path / "out.json")
+        monkeypatch.setattr(run_test, "save_results", save)
+        monkeypatch.setattr(sys, "argv", ["run_test.py", "--model", "m", "--fixture", fixture.name, "--runs", "3"])
+        return run_test.main(), save
+
+    def test_truncated_fixture_sets_error_exit_code(self, tmp_path, monkeypatch):
+        exit_code, save = self._run_main(tmp_path, monkeypatch, [make_result()])
+        assert exit_code == 1
+        assert save.call_args.kwargs["requested_runs"] == 1
+
+    def test_complete_fixture_exits_zero(self, tmp_path, monkeypatch):
+        exit_code, save = self._run_main(tmp_path, monkeypatch, [make_result() for _ in range(3)])
+        assert exit_code == 0
+        assert save.call_args.kwargs["requested_runs"] == 3